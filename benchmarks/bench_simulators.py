@@ -0,0 +1,324 @@
+import argparse
+import gc
+import importlib.util
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Locations of the simulators relative to this file
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'n-turing-machine'))
+
+import traceTM_aniceto  # noqa: E402  (imported after extending the path)
+
+# The k-tape module name contains a dash, so it is loaded from its file path
+ktape_spec = importlib.util.spec_from_file_location('ktape_aniceto', os.path.join(REPO_ROOT, 'k-tape', 'ktape-aniceto.py'))
+ktape_aniceto = importlib.util.module_from_spec(ktape_spec)
+ktape_spec.loader.exec_module(ktape_aniceto)
+
+# Classic busy beaver tables: state -> ((write, move, next) reading blank, (write, move, next) reading 1)
+BUSY_BEAVERS = {
+    2: {'A': (('1', 'R', 'B'), ('1', 'L', 'B')), 'B': (('1', 'L', 'A'), ('1', 'R', 'H'))},
+    3: {'A': (('1', 'R', 'B'), ('1', 'R', 'H')), 'B': (('_', 'R', 'C'), ('1', 'R', 'B')),
+        'C': (('1', 'L', 'C'), ('1', 'L', 'A'))},
+    4: {'A': (('1', 'R', 'B'), ('1', 'L', 'B')), 'B': (('1', 'L', 'A'), ('_', 'L', 'C')),
+        'C': (('1', 'R', 'H'), ('1', 'L', 'D')), 'D': (('1', 'R', 'D'), ('_', 'R', 'A'))},
+}
+
+
+def write_csv_machine(path, name, states, input_alphabet, tape_alphabet, start, accept, reject, rules):
+    """
+    Write a single-tape machine in the NewTuringMachine CSV format.
+
+    Parameters:
+    path (str): Path of the file to write.
+    name (str): Name of the machine.
+    states (list): All states, including the accept and reject states.
+    input_alphabet (list): Symbols allowed in the input.
+    tape_alphabet (list): Symbols allowed on the tape.
+    start (str): Start state.
+    accept (str): Accept state.
+    reject (str): Reject state.
+    rules (list): Rules as (state, read, next state, write, direction) tuples.
+    """
+    lines = [name, ','.join(states), ','.join(input_alphabet), ','.join(tape_alphabet), start, accept, reject]
+    lines += [','.join(rule) for rule in rules]
+    with open(path, 'w') as opened_file:
+        opened_file.write('\n'.join(lines) + '\n')
+
+
+def write_ktape_machine(path, states, alphabet, num_tapes, start, accept, rules):
+    """
+    Write a multi-tape machine in the counted k-tape definition format (blank symbol '_').
+
+    Parameters:
+    path (str): Path of the file to write.
+    states (list): All states.
+    alphabet (list): Tape symbols other than the blank.
+    num_tapes (int): Number of tapes.
+    start (str): Start state.
+    accept (str): Accept state.
+    rules (list): Rules as (state, reads, next state, writes, moves) tuples with one entry per tape in each list.
+    """
+    lines = [str(len(states)), ' '.join(states), str(num_tapes), ' '.join(alphabet), str(len(rules))]
+    for state, reads, next_state, writes, moves in rules:
+        lines.append(' | '.join(f'{state} {reads[i]} {next_state} {writes[i]} {moves[i]}' for i in range(num_tapes)))
+    lines += [start, accept]
+    with open(path, 'w') as opened_file:
+        opened_file.write('\n'.join(lines) + '\n')
+
+
+def counter_csv(directory):
+    """
+    Generate a deterministic binary counter that counts up from '#00..0' until it overflows.
+
+    The machine runs in O(n * 2^n) steps for n counter digits.
+
+    Returns:
+    str: Path of the generated machine.
+    """
+    path = os.path.join(directory, 'counter.csv')
+    rules = [('r', '0', 'r', '0', 'R'), ('r', '1', 'r', '1', 'R'), ('r', '#', 'r', '#', 'R'), ('r', '_', 'c', '_', 'L'),
+             ('c', '1', 'c', '0', 'L'), ('c', '0', 'r', '1', 'R'), ('c', '#', 'acc', '#', 'R')]
+    write_csv_machine(path, 'counter', ['r', 'c', 'acc', 'rej'], ['0', '#'], ['0', '1', '#'], 'r', 'acc', 'rej', rules)
+    return path
+
+
+def busy_beaver_csv(directory, size, offset=64):
+    """
+    Generate a busy beaver machine for the single-tape simulator.
+
+    The single-tape simulator does not move left of the first cell, so the machine first walks `offset` cells
+    to the right over blanks before starting the busy beaver table.
+
+    Returns:
+    str: Path of the generated machine.
+    """
+    path = os.path.join(directory, f'busy_beaver_{size}.csv')
+    table = BUSY_BEAVERS[size]
+    preamble = [f'p{i}' for i in range(offset)]
+    rules = [(preamble[i], '_', preamble[i + 1] if i + 1 < offset else 'A', '_', 'R') for i in range(offset)]
+    for state, actions in table.items():
+        for read, (write, move, next_state) in zip(('_', '1'), actions):
+            rules.append((state, read, next_state, write, move))
+    states = preamble + list(table) + ['H', 'rej']
+    write_csv_machine(path, f'busy_beaver_{size}', states, ['1'], ['1'], preamble[0], 'H', 'rej', rules)
+    return path
+
+
+def branching_csv(directory, branching):
+    """
+    Generate a nondeterministic machine with a fixed branching factor that rejects every input.
+
+    Every input symbol can be rewritten to any of `branching` symbols, so an input of length n produces a full
+    computation tree with branching^n leaves.
+
+    Returns:
+    str: Path of the generated machine.
+    """
+    path = os.path.join(directory, f'branching_{branching}.csv')
+    symbols = [chr(ord('a') + i) for i in range(branching)]
+    rules = [('q0', '0', 'q0', symbol, 'R') for symbol in symbols]
+    write_csv_machine(path, f'branching_{branching}', ['q0', 'qa', 'qr'], ['0'], ['0'] + symbols, 'q0', 'qa', 'qr', rules)
+    return path
+
+
+def counter_ktape(directory):
+    """
+    Generate a two-tape binary counter; tape 2 receives one tally mark per increment.
+
+    Returns:
+    str: Path of the generated machine.
+    """
+    path = os.path.join(directory, 'counter.ktape')
+    rules = [('r', ['0', '_'], 'r', ['0', '_'], ['R', 'S']), ('r', ['1', '_'], 'r', ['1', '_'], ['R', 'S']),
+             ('r', ['#', '_'], 'r', ['#', '_'], ['R', 'S']), ('r', ['_', '_'], 'c', ['_', '_'], ['L', 'S']),
+             ('c', ['1', '_'], 'c', ['0', '_'], ['L', 'S']), ('c', ['0', '_'], 'r', ['1', '1'], ['R', 'R']),
+             ('c', ['#', '_'], 'H', ['#', '_'], ['S', 'S'])]
+    write_ktape_machine(path, ['r', 'c', 'H'], ['0', '1', '#'], 2, 'r', 'H', rules)
+    return path
+
+
+def busy_beaver_ktape(directory, size):
+    """
+    Generate a busy beaver machine on tape 1 of a two-tape machine whose second tape stays idle.
+
+    Returns:
+    str: Path of the generated machine.
+    """
+    path = os.path.join(directory, f'busy_beaver_{size}.ktape')
+    table = BUSY_BEAVERS[size]
+    rules = []
+    for state, actions in table.items():
+        for read, (write, move, next_state) in zip(('_', '1'), actions):
+            rules.append((state, [read, '_'], next_state, [write, '_'], [move, 'S']))
+    write_ktape_machine(path, list(table) + ['H'], ['1'], 2, 'A', 'H', rules)
+    return path
+
+
+def measure(function, repeat):
+    """
+    Time a function and record the peak memory it allocates.
+
+    Parameters:
+    function (callable): The function to measure.
+    repeat (int): Number of timed runs; the fastest one is reported.
+
+    Returns:
+    tuple: The fastest run time in seconds, the peak traced memory in bytes and the function's last result.
+    """
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    # Memory is traced in a separate run so tracing does not distort the timings
+    gc.collect()
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def record(results, machine, operation, engine, input_length, seconds, peak, steps=None, nodes=None, workers=1):
+    """Append one benchmark record with derived throughput figures."""
+    entry = {'machine': machine, 'operation': operation, 'engine': engine, 'workers': workers,
+             'input_length': input_length, 'seconds': seconds, 'peak_memory_bytes': peak, 'steps': steps,
+             'nodes': nodes}
+    if steps is not None:
+        entry['steps_per_second'] = steps / seconds if seconds else None
+    if nodes is not None:
+        entry['nodes_per_second'] = nodes / seconds if seconds else None
+    results.append(entry)
+    print(f"{machine:>16} {operation:>16} {engine:>8} x{workers:<3} n={input_length:<4} {seconds * 1000:10.2f} ms "
+          f"{peak / 1024:10.1f} KiB", file=sys.stderr)
+
+
+def bench_single_tape(results, path, inputs, repeat, engines, accelerate=False, parallel_options=None):
+    """
+    Benchmark compute_tree, compute_path_len and set_output for one single-tape machine over several inputs.
+
+    For deterministic machines, `accelerate` adds a decide_accelerated measurement.
+
+    Parameters:
+    results (list): The list the records are appended to.
+    path (str): Path of the machine in the CSV format.
+    inputs (list): The input strings to simulate.
+    repeat (int): Number of timed runs per measurement.
+    engines (list): Names of the simulation engines to benchmark.
+    accelerate (bool): Whether to also benchmark the macro-step decider.
+    parallel_options (dict): The workers and min_parallel options of the parallel engine.
+    """
+    turing_machine = traceTM_aniceto.NewTuringMachine(path)
+    transitions = turing_machine.compile_transitions()
+    name = turing_machine.machine_name[0]
+    for input_string in inputs:
+        for engine in engines:
+            options = (parallel_options or {}) if engine == 'parallel' else {}
+            simulator = traceTM_aniceto.ENGINES[engine](turing_machine, **options)
+            seconds, peak, (tree, _) = measure(lambda: simulator.compute_tree(input_string, transitions), repeat)
+            record(results, name, 'compute_tree', engine, len(input_string), seconds, peak,
+                   simulator.steps, simulator.node_count, getattr(simulator, 'workers', 1))
+        if accelerate:
+            simulator = traceTM_aniceto.TuringMachineSimulator(turing_machine)
+            seconds, peak, _ = measure(lambda: simulator.decide_accelerated(input_string, transitions), repeat)
+            record(results, name, 'decide_accel', 'python', len(input_string), seconds, peak,
+                   simulator.steps, simulator.node_count)
+        simulator = traceTM_aniceto.TuringMachineSimulator(turing_machine)
+        tree, _ = simulator.compute_tree(input_string, transitions)
+        seconds, peak, path_states = measure(lambda: simulator.compute_path_len(tree), repeat)
+        record(results, name, 'compute_path_len', 'python', len(input_string), seconds, peak, len(path_states) - 1)
+        seconds, peak, lines = measure(lambda: simulator.set_output(tree), repeat)
+        record(results, name, 'set_output', 'python', len(input_string), seconds, peak, len(lines) - 1)
+
+
+def bench_ktape(results, path, inputs, repeat):
+    """
+    Benchmark KTapeTuringMachine.simulate for one k-tape machine over several inputs, tracing only a summary,
+    both step by step and in cached macro steps.
+
+    Parameters:
+    results (list): The list the records are appended to.
+    path (str): Path of the machine definition.
+    inputs (list): The contents of tape 1 for each run.
+    repeat (int): Number of timed runs per measurement.
+    """
+    machine = ktape_aniceto.load_definition(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+
+    def run(input_string, macro_window=None):
+        machine.reset(input_string)
+        return machine.simulate(every=0, out=io.StringIO(), macro_window=macro_window)
+
+    for input_string in inputs:
+        seconds, peak, steps = measure(lambda: run(input_string), repeat)
+        record(results, name, 'simulate', 'ktape', len(input_string), seconds, peak, steps)
+        seconds, peak, steps = measure(lambda: run(input_string, 8), repeat)
+        record(results, name, 'simulate_accel', 'ktape', len(input_string), seconds, peak, steps)
+
+
+def git_commit():
+    """Return the current commit id of the repository, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """Generate the benchmark machines, run every benchmark and write the results as JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark the Turing machine simulators")
+    parser.add_argument('--output', type=str, default=None, help='Write the JSON results to this file (default: stdout)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per measurement; the fastest is kept')
+    parser.add_argument('--quick', action='store_true', help='Use small inputs only')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes of the parallel engine (default: number of CPUs)')
+    parser.add_argument('--min-parallel', type=int, default=1024,
+                        help='Smallest level the parallel engine splits across workers (default: 1024)')
+    args = parser.parse_args()
+
+    counter_digits = [2, 4, 6] if args.quick else [4, 6, 8, 10]
+    branching_lengths = {2: [4, 6] if args.quick else [6, 9, 12], 3: [3, 4] if args.quick else [4, 6, 8]}
+    # Branching factor 4 gives frontiers of 4^n configurations, so the last levels reach --min-parallel
+    wide_lengths = [5, 6] if args.quick else [6, 7, 8]
+    engines = ['python', 'parallel'] + (['numpy'] if traceTM_aniceto.np is not None else [])
+    parallel_options = {'workers': args.workers, 'min_parallel': args.min_parallel}
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        bench_single_tape(results, counter_csv(directory), ['#' + '0' * n for n in counter_digits], args.repeat, engines,
+                          True, parallel_options)
+        for size in sorted(BUSY_BEAVERS):
+            bench_single_tape(results, busy_beaver_csv(directory, size), [''], args.repeat, engines, True,
+                              parallel_options)
+        for branching, lengths in branching_lengths.items():
+            bench_single_tape(results, branching_csv(directory, branching), ['0' * n for n in lengths], args.repeat,
+                              engines, parallel_options=parallel_options)
+        bench_single_tape(results, branching_csv(directory, 4), ['0' * n for n in wide_lengths], args.repeat, engines,
+                          parallel_options=parallel_options)
+        bench_ktape(results, counter_ktape(directory), ['#' + '0' * n for n in counter_digits], args.repeat)
+        for size in sorted(BUSY_BEAVERS):
+            bench_ktape(results, busy_beaver_ktape(directory, size), [''], args.repeat)
+
+    report = {'commit': git_commit(), 'python': platform.python_version(), 'platform': platform.platform(),
+              'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'cpu_count': os.cpu_count(), 'workers': args.workers,
+              'min_parallel': args.min_parallel, 'results': results}
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as opened_file:
+            json.dump(report, opened_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
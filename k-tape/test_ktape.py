@@ -0,0 +1,201 @@
+"""Behavior tests for the k-tape simulator and its command line."""
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+# The module name contains a dash, so it is loaded from its file path
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ktape-aniceto.py')
+ktape_spec = importlib.util.spec_from_file_location('ktape_aniceto', SCRIPT)
+ktape_aniceto = importlib.util.module_from_spec(ktape_spec)
+ktape_spec.loader.exec_module(ktape_aniceto)
+
+# A two-tape binary counter in the counted format: it counts tape 1 up from '#0..0' until it overflows and
+# writes one tally mark on tape 2 per increment
+COUNTER = """3
+r c H
+2
+0 1 #
+7
+r 0 r 0 R | r _ r _ S
+r 1 r 1 R | r _ r _ S
+r # r # R | r _ r _ S
+r _ c _ L | r _ c _ S
+c 1 c 0 L | c _ c _ S
+c 0 r 1 R | c _ r 1 R
+c # H # S | c _ H _ S
+r
+H
+"""
+
+
+def write_counter(directory):
+    """Write the counter definition to a file and return its path."""
+    path = os.path.join(directory, 'counter.txt')
+    with open(path, 'w') as opened_file:
+        opened_file.write(COUNTER)
+    return path
+
+
+def run_cli(*arguments):
+    """Run the command line and return its standard output."""
+    return subprocess.run([sys.executable, SCRIPT, *arguments], capture_output=True, text=True, check=True).stdout
+
+
+def counter_lines(output):
+    """Return the output lines that report counts, leaving out the timings."""
+    return [line for line in output.splitlines() if not line.startswith(('Phase ', 'Step ', 'Tape ', 'Final '))]
+
+
+def test_accelerated_stats_match_stepwise(tmp_path):
+    definition = ktape_aniceto.read_definition(write_counter(str(tmp_path)))
+    results = []
+    for macro_window in (None, 1, 3, 8):
+        machine = ktape_aniceto.KTapeTuringMachine(**definition)
+        machine.stats = ktape_aniceto.Stats()
+        machine.reset('#0000')
+        steps = machine.simulate(every=0, out=io.StringIO(), macro_window=macro_window)
+        stats = machine.stats
+        results.append((steps, stats.lookups, stats.matched, stats.wildcard_resolutions, stats.tape_high_water,
+                        dict(stats.state_hits)))
+    assert results[0][1] == results[0][0] + 1  # One lookup per step and one that matched nothing
+    assert all(result == results[0] for result in results[1:])
+
+
+def test_cli_accelerate_stats_match_plain_run(tmp_path):
+    path = write_counter(str(tmp_path))
+    plain = counter_lines(run_cli(path, '#000000', '--every', '0', '--stats'))
+    accelerated = counter_lines(run_cli(path, '#000000', '--stats', '--accelerate', '--macro-window', '4'))
+    assert any(line.startswith('Transitions Tried: ') for line in plain)
+    assert accelerated == plain
+
+
+def test_batch_reports_stats_per_run(tmp_path):
+    path = write_counter(str(tmp_path))
+    batch = os.path.join(str(tmp_path), 'inputs.txt')
+    with open(batch, 'w') as opened_file:
+        opened_file.write('#000\n#000\n#000\n')
+    output = run_cli(path, '--batch', batch, '--every', '0', '--stats')
+    # Wildcard resolutions are cached on the machine, so only the first run resolves them
+    tried = [line.split(', ')[:2] for line in output.splitlines() if line.startswith('Transitions Tried: ')]
+    assert len(tried) == 3
+    assert tried[0] == tried[1] == tried[2]
+
+
+def test_demo_matches_readme():
+    output = run_cli().splitlines()
+    assert output[:4] == ['Binary Increment Machine Simulation Start', 'Step 0: State=continue', 'Tape 1: [*]101',
+                          'Tape 2: [*]']
+    finals = [output[index - 2] for index, line in enumerate(output) if line == 'Simulation complete']
+    assert finals == ['Tape 1: [1]101', 'Tape 1: [1]111', 'Tape 1: [1]101']
+
+
+def test_render_marks_the_head():
+    tape = ktape_aniceto.Tape('abc')
+    tape[-2] = 'x'
+    assert str(tape) == 'x*abc'
+    assert tape.render(0) == 'x*[a]bc'
+    assert tape.render(4) == 'x*abc*[*]'
+    assert tape.render(-2, window=1) == '*[x]*'
+
+
+def test_every_n_shows_the_halting_configuration(tmp_path):
+    path = write_counter(str(tmp_path))
+    every_step = run_cli(path, '#00', '--every', '1').splitlines()
+    # The counter halts after 15 steps, so every fifth step skips the halting configuration
+    every_fifth = run_cli(path, '#00', '--every', '5').splitlines()
+    assert every_step[-5] == 'Step 14: State=H'
+    assert every_fifth[-5:-2] == ['Final State=H after 15 steps'] + every_step[-4:-2]
+    # It is shown once when it falls on a traced step
+    every_seventh = run_cli(path, '#00', '--every', '7').splitlines()
+    assert every_seventh[-5:] == every_step[-5:]
+
+
+def test_reads_both_definition_formats():
+    directory = os.path.dirname(SCRIPT)
+    counted = ktape_aniceto.read_definition(os.path.join(directory, 'machine_def.txt'))
+    assert (counted['num_tapes'], counted['initial_state'], counted['accept_state'], counted['blank']) == \
+        (2, 'A', 'D', '_')
+    assert counted['transitions'][('A', 'c', '_')] == ('B', ['c', '_'], ['S', 'L'])
+    compact = ktape_aniceto.read_definition(os.path.join(directory, 'a_plus.txt'))
+    assert (compact['name'], compact['num_tapes'], compact['initial_state']) == ('MyMachine', 2, 'START')
+    assert compact['transitions'][('B', '*', '*')] == ('END', ['*', '*'], ['S', 'S'])
+
+
+def test_definition_cache_follows_the_file(tmp_path, monkeypatch):
+    path = write_counter(str(tmp_path))
+    monkeypatch.setattr(ktape_aniceto, 'definition_cache', {})
+    machine = ktape_aniceto.load_definition(path)
+    assert ktape_aniceto.load_definition(path) is machine
+    # A rewritten file is parsed again
+    with open(path, 'w') as opened_file:
+        opened_file.write(COUNTER.replace('\nH\n', '\nc\n'))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    changed = ktape_aniceto.load_definition(path)
+    assert changed is not machine
+    assert (machine.accept_state, changed.accept_state) == ('H', 'c')
+
+
+def test_definition_cache_dir_skips_parsing(tmp_path, monkeypatch):
+    path = write_counter(str(tmp_path))
+    cache_dir = os.path.join(str(tmp_path), 'cache')
+    monkeypatch.setattr(ktape_aniceto, 'definition_cache', {})
+    ktape_aniceto.load_definition(path, cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    def read_definition(path):
+        raise AssertionError('parsed again')
+
+    # A new process finds the pickled definition instead of parsing the file
+    monkeypatch.setattr(ktape_aniceto, 'definition_cache', {})
+    monkeypatch.setattr(ktape_aniceto, 'read_definition', read_definition)
+    assert ktape_aniceto.load_definition(path, cache_dir).accept_state == 'H'
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    monkeypatch.setattr(ktape_aniceto, 'definition_cache', {})
+    with pytest.raises(AssertionError):
+        ktape_aniceto.load_definition(path, cache_dir)
+
+
+class Killed(Exception):
+    pass
+
+
+def test_checkpoint_resumes_a_killed_run(tmp_path):
+    definition = ktape_aniceto.read_definition(write_counter(str(tmp_path)))
+    checkpoint = os.path.join(str(tmp_path), 'counter.ckpt')
+    expected = ktape_aniceto.KTapeTuringMachine(**definition)
+    expected.reset('#0000')
+    steps = expected.simulate(every=0, out=io.StringIO())
+
+    def kill(machine, step):
+        if step == 40:
+            raise Killed()
+
+    machine = ktape_aniceto.KTapeTuringMachine(**definition)
+    machine.on_step = kill
+    machine.reset('#0000')
+    with pytest.raises(Killed):
+        machine.simulate(every=0, out=io.StringIO(), checkpoint=checkpoint, checkpoint_every=0.0)
+    assert os.path.exists(checkpoint)
+
+    resumed = ktape_aniceto.KTapeTuringMachine(**definition)
+    resumed.reset('#0000')
+    assert resumed.simulate(every=0, out=io.StringIO(), checkpoint=checkpoint, resume=True) == steps
+    assert resumed.current_state == expected.current_state
+    assert [str(tape) for tape in resumed.tapes] == [str(tape) for tape in expected.tapes]
+    assert resumed.heads == expected.heads
+    assert not os.path.exists(checkpoint)
+
+
+def test_checkpoint_belongs_to_its_input(tmp_path):
+    definition = ktape_aniceto.read_definition(write_counter(str(tmp_path)))
+    checkpoint = os.path.join(str(tmp_path), 'counter.ckpt')
+    machine = ktape_aniceto.KTapeTuringMachine(**definition)
+    machine.reset('#0000')
+    machine.save_checkpoint(checkpoint, 3)
+    machine.reset('#000')
+    with pytest.raises(ValueError):
+        machine.load_checkpoint(checkpoint)
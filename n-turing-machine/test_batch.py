@@ -0,0 +1,61 @@
+"""Behavior tests for running one machine over a batch of input strings."""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, DIRECTORY)
+
+import traceTM_aniceto  # noqa: E402  (imported after extending the path)
+
+SCRIPT = os.path.join(DIRECTORY, 'traceTM_aniceto.py')
+CONTAINS010 = os.path.join(DIRECTORY, 'contains010.csv')
+
+# Input strings of different lengths, so the chunks of a pool finish out of order
+INPUTS = [format(number, 'b') * (number % 7 + 1) for number in range(60)]
+
+
+def make_runner(**search_options):
+    """Return a BatchRunner for the contains010 machine."""
+    turing_machine = traceTM_aniceto.NewTuringMachine(CONTAINS010)
+    return traceTM_aniceto.BatchRunner(turing_machine, turing_machine.compile_transitions(), **search_options)
+
+
+@pytest.mark.parametrize('workers, chunk_size', [(2, 1), (2, 4), (3, 64)])
+def test_pool_keeps_input_order(workers, chunk_size):
+    runner = make_runner(max_nodes=1000)
+    expected = [runner.run(input_string) for input_string in INPUTS]
+    assert list(runner.run_all(INPUTS, workers, chunk_size)) == expected
+    assert [result['input'] for result in expected] == INPUTS
+    assert {result['status'] for result in expected} == {'accepted', 'rejected'}
+
+
+def test_pool_reads_input_lazily():
+    consumed = []
+
+    def input_strings():
+        for input_string in INPUTS:
+            consumed.append(input_string)
+            yield input_string
+
+    results = make_runner().run_all(input_strings(), workers=2, chunk_size=3)
+    next(results)
+    # At most two chunks per worker are read ahead of the first result
+    assert len(consumed) <= 2 * 2 * 3
+    assert len(list(results)) == len(INPUTS) - 1
+
+
+def test_cli_batch_streams_json_lines(tmp_path):
+    batch = os.path.join(str(tmp_path), 'inputs.txt')
+    with open(batch, 'w') as opened_file:
+        opened_file.write('010\r\n000\n\n1111\n')
+    output = subprocess.run([sys.executable, SCRIPT, CONTAINS010, '--batch', batch, '--workers', '2',
+                             '--chunk-size', '1'], capture_output=True, text=True, check=True).stdout
+    results = [json.loads(line) for line in output.splitlines()]
+    assert results == [{'input': '010', 'status': 'accepted', 'steps': 3, 'transitions': 3},
+                       {'input': '000', 'status': 'rejected', 'steps': 3, 'transitions': 4},
+                       {'input': '', 'status': 'rejected', 'steps': 0, 'transitions': 1},
+                       {'input': '1111', 'status': 'rejected', 'steps': 4, 'transitions': 5}]
@@ -0,0 +1,47 @@
+"""Behavior tests for the search budgets and the undecided verdict."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, DIRECTORY)
+
+import traceTM_aniceto  # noqa: E402  (imported after extending the path)
+
+SCRIPT = os.path.join(DIRECTORY, 'traceTM_aniceto.py')
+CONTAINS010 = os.path.join(DIRECTORY, 'contains010.csv')
+
+
+def verdict(*arguments):
+    """Run the command line without an output file and return its verdict line."""
+    output = subprocess.run([sys.executable, SCRIPT, CONTAINS010, *arguments, '--output', os.devnull],
+                            capture_output=True, text=True, check=True).stdout
+    return output.splitlines()[4]
+
+
+@pytest.mark.parametrize('engine', sorted(traceTM_aniceto.ENGINES) if traceTM_aniceto.np is not None
+                         else ['parallel', 'python'])
+def test_node_budget_reports_last_level_built(engine):
+    # The budget runs out exactly at the end of a level, so the next level is never started
+    assert verdict('1111', '--max-nodes', '3', '--engine', engine, '--min-parallel', '1') == \
+        'String undecided after 2 steps (max-nodes budget exhausted at depth 2, 3 configurations)'
+
+
+def test_depth_budget():
+    assert verdict('1111', '--max-depth', '2') == \
+        'String undecided after 2 steps (max-depth budget exhausted at depth 2, 3 configurations)'
+
+
+def test_budget_that_is_not_reached():
+    assert verdict('1111', '--max-nodes', '6') == 'String rejected in 4 steps'
+
+
+def test_empty_level_is_not_kept():
+    turing_machine = traceTM_aniceto.NewTuringMachine(CONTAINS010)
+    simulator = traceTM_aniceto.TuringMachineSimulator(turing_machine)
+    computation_tree, status = simulator.compute_tree('1111', turing_machine.compile_transitions(), max_nodes=3)
+    assert status == traceTM_aniceto.UNDECIDED
+    assert simulator.budget_exhausted == 'max-nodes'
+    assert len(computation_tree) == simulator.steps + 1 == 3
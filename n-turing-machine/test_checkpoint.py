@@ -0,0 +1,93 @@
+"""Behavior tests for checkpointing a search and resuming it."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, DIRECTORY)
+
+import traceTM_aniceto  # noqa: E402  (imported after extending the path)
+
+SCRIPT = os.path.join(DIRECTORY, 'traceTM_aniceto.py')
+
+# A machine that guesses where to flip a bit and accepts once it reads past the end in state q1, so its
+# levels keep widening and some configurations are reached along several branches
+GUESS = """guess
+q0,q1,qa,qr
+0,1
+0,1
+q0
+qa
+qr
+q0,0,q0,0,R
+q0,0,q1,1,R
+q0,1,q0,1,R
+q0,1,q1,0,R
+q1,0,q1,0,R
+q1,1,q0,1,L
+q1,_,qa,_,R
+q0,_,q0,_,L
+"""
+INPUT = '1011011011'
+
+
+def write_guess(directory):
+    """Write the guessing machine to a file and return its path."""
+    path = os.path.join(directory, 'guess.csv')
+    with open(path, 'w') as opened_file:
+        opened_file.write(GUESS)
+    return path
+
+
+def search(turing_machine, **options):
+    """Compute the tree of the input and return the outcome with the trace."""
+    simulator = traceTM_aniceto.TuringMachineSimulator(turing_machine)
+    computation_tree, status = simulator.compute_tree(INPUT, turing_machine.compile_transitions(), **options)
+    return (status, simulator.steps, simulator.node_count, simulator.pruned_count, simulator.budget_exhausted,
+            list(simulator.iter_output(computation_tree)))
+
+
+@pytest.mark.parametrize('deduplicate', [False, True])
+def test_resume_matches_an_uninterrupted_search(tmp_path, monkeypatch, deduplicate):
+    # Write the frontier and visited set in several chunks
+    monkeypatch.setattr(traceTM_aniceto, 'CHECKPOINT_CHUNK', 4)
+    turing_machine = traceTM_aniceto.NewTuringMachine(write_guess(str(tmp_path)))
+    checkpoint = os.path.join(str(tmp_path), 'guess.ckpt')
+    expected = search(turing_machine, deduplicate=deduplicate)
+    stopped = search(turing_machine, deduplicate=deduplicate, max_depth=6, checkpoint=checkpoint)
+    assert stopped[0] == traceTM_aniceto.UNDECIDED
+    assert os.path.exists(checkpoint)
+    assert search(turing_machine, deduplicate=deduplicate, checkpoint=checkpoint, resume=True) == expected
+    assert not os.path.exists(checkpoint)
+
+
+def test_resume_without_a_checkpoint_starts_over(tmp_path):
+    turing_machine = traceTM_aniceto.NewTuringMachine(write_guess(str(tmp_path)))
+    checkpoint = os.path.join(str(tmp_path), 'guess.ckpt')
+    assert search(turing_machine, checkpoint=checkpoint, resume=True) == search(turing_machine)
+
+
+def test_checkpoint_is_rejected_for_other_settings(tmp_path):
+    turing_machine = traceTM_aniceto.NewTuringMachine(write_guess(str(tmp_path)))
+    transitions = turing_machine.compile_transitions()
+    checkpoint = os.path.join(str(tmp_path), 'guess.ckpt')
+    search(turing_machine, max_depth=3, checkpoint=checkpoint)
+    simulator = traceTM_aniceto.TuringMachineSimulator(turing_machine)
+    with pytest.raises(ValueError):
+        simulator.compute_tree(INPUT + '0', transitions, checkpoint=checkpoint, resume=True)
+    with pytest.raises(ValueError):
+        simulator.compute_tree(INPUT, transitions, deduplicate=True, checkpoint=checkpoint, resume=True)
+
+
+def test_cli_resumes_with_a_larger_budget(tmp_path):
+    path = write_guess(str(tmp_path))
+    checkpoint = os.path.join(str(tmp_path), 'guess.ckpt')
+
+    def run(*arguments):
+        return subprocess.run([sys.executable, SCRIPT, path, INPUT, '--checkpoint', checkpoint, '--output',
+                               os.devnull, *arguments], capture_output=True, text=True, check=True).stdout
+
+    assert 'undecided' in run('--max-depth', '5').splitlines()[4]
+    assert run('--resume').splitlines()[3:5] == ['Total Transitions Traced: 291', 'String accepted in 11 steps']
@@ -0,0 +1,85 @@
+"""Behavior tests for the deduplication of configurations reached along different branches."""
+import os
+import subprocess
+import sys
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, DIRECTORY)
+
+import traceTM_aniceto  # noqa: E402  (imported after extending the path)
+
+SCRIPT = os.path.join(DIRECTORY, 'traceTM_aniceto.py')
+
+# A machine that bounces between the first two cells forever, and branches into a second loop that only
+# accepts when it finds a second 0
+LOOP = """loop
+q0,q1,qa,qr
+0,1
+0,1
+q0
+qa
+qr
+q0,0,q0,0,R
+q0,0,q1,1,R
+q0,_,q0,_,L
+q1,_,q1,_,L
+q1,1,q1,1,R
+q1,0,qa,0,R
+"""
+
+
+def write_loop(directory):
+    """Write the looping machine to a file and return its path."""
+    path = os.path.join(directory, 'loop.csv')
+    with open(path, 'w') as opened_file:
+        opened_file.write(LOOP)
+    return path
+
+
+def load_loop(directory):
+    """Write the looping machine to a file and return it with its compiled transitions."""
+    turing_machine = traceTM_aniceto.NewTuringMachine(write_loop(directory))
+    return turing_machine, turing_machine.compile_transitions()
+
+
+def test_tape_hash_updates_incrementally():
+    blank = 0
+    tape = bytearray([1, 2, 2, 1])
+    value = traceTM_aniceto.tape_hash(tape, blank)
+    # Trailing blanks do not change the hash
+    assert traceTM_aniceto.tape_hash(tape + bytearray([blank] * 3), blank) == value
+    # Writing a cell updates the hash by the contributions of the old and new symbols
+    value ^= traceTM_aniceto.cell_hash(2, 2, blank) ^ traceTM_aniceto.cell_hash(2, 1, blank)
+    tape[2] = 1
+    assert traceTM_aniceto.tape_hash(tape, blank) == value
+
+
+def test_deduplication_decides_a_looping_machine(tmp_path):
+    turing_machine, transitions = load_loop(str(tmp_path))
+    simulator = traceTM_aniceto.TuringMachineSimulator(turing_machine)
+    simulator.compute_tree('0', transitions, max_nodes=1000)
+    assert simulator.status == traceTM_aniceto.UNDECIDED
+    assert simulator.pruned_count == 0
+    simulator.compute_tree('0', transitions, max_nodes=1000, deduplicate=True)
+    assert simulator.status == 'qr'
+    assert simulator.pruned_count == 2
+    assert simulator.budget_exhausted is None
+
+
+def test_deduplication_keeps_the_accepting_path(tmp_path):
+    turing_machine, transitions = load_loop(str(tmp_path))
+    results = []
+    for deduplicate in (False, True):
+        simulator = traceTM_aniceto.TuringMachineSimulator(turing_machine)
+        computation_tree, status = simulator.compute_tree('000', transitions, deduplicate=deduplicate)
+        results.append((status, simulator.steps, list(simulator.iter_output(computation_tree))))
+    assert results[0][0] == 'qa'
+    assert results[1] == results[0]
+
+
+def test_cli_reports_pruned_configurations(tmp_path):
+    path = write_loop(str(tmp_path))
+    output = subprocess.run([sys.executable, SCRIPT, path, '0', '--deduplicate', '--output', os.devnull],
+                            capture_output=True, text=True, check=True).stdout
+    assert 'Duplicate Configurations Pruned: 2' in output.splitlines()
+    assert 'String rejected in 2 steps' in output.splitlines()
@@ -0,0 +1,128 @@
+"""Check that every simulation engine reports the same results on random machines."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import traceTM_aniceto  # noqa: E402  (imported after extending the path)
+
+# Search budgets tried on every input, covering cuts by depth and by node count in the middle of a level
+BUDGETS = [{'max_depth': 12, 'max_nodes': None}, {'max_depth': None, 'max_nodes': 7},
+           {'max_depth': 5, 'max_nodes': 300}, {'max_depth': None, 'max_nodes': 2000}]
+
+
+def random_machine(directory, rng, deterministic):
+    """
+    Write a random machine over the symbols 0, 1 and the blank and load it.
+
+    Parameters:
+    directory (str): Directory the machine file is written to.
+    rng (random.Random): The random number generator.
+    deterministic (bool): Whether to give each (state, symbol) pair at most one rule.
+
+    Returns:
+    tuple: The NewTuringMachine and its CompiledTransitions.
+    """
+    count = rng.randint(2, 5)
+    states = [f'q{i}' for i in range(count)] + ['qa', 'qr']
+    rules = []
+    for state in states[:count]:
+        for symbol in '01_':
+            for _ in range(rng.choice([0, 1, 1, 1]) if deterministic else rng.choice([0, 1, 1, 2, 2, 3])):
+                rules.append(','.join([state, symbol, rng.choice(states[:count] * 3 + states[count:]),
+                                       rng.choice('01_'), rng.choice('LR')]))
+    path = os.path.join(directory, 'random.csv')
+    with open(path, 'w') as opened_file:
+        opened_file.write('random\n' + ','.join(states) + '\n0,1\n0,1\nq0\nqa\nqr\n' + '\n'.join(rules) + '\n')
+    turing_machine = traceTM_aniceto.NewTuringMachine(path)
+    return turing_machine, turing_machine.compile_transitions()
+
+
+def random_inputs(rng, count, longest):
+    """Return `count` random strings of 0 and 1 with up to `longest` characters."""
+    return [''.join(rng.choice('01') for _ in range(rng.randint(0, longest))) for _ in range(count)]
+
+
+def run(simulator, input_string, transitions, budget):
+    """Compute the tree of one input and return everything the engines must agree on, with the trace."""
+    computation_tree, status = simulator.compute_tree(input_string, transitions, **budget)
+    return (status, simulator.steps, simulator.node_count, simulator.budget_exhausted,
+            list(simulator.iter_output(computation_tree)))
+
+
+@pytest.mark.skipif(traceTM_aniceto.np is None, reason='the numpy engine requires NumPy')
+@pytest.mark.parametrize('seed', range(4))
+def test_numpy_matches_python(tmp_path, seed):
+    rng = random.Random(seed)
+    for _ in range(40):
+        turing_machine, transitions = random_machine(str(tmp_path), rng, deterministic=False)
+        for input_string in random_inputs(rng, 3, 6):
+            for budget in BUDGETS:
+                expected = run(traceTM_aniceto.TuringMachineSimulator(turing_machine), input_string, transitions,
+                               budget)
+                actual = run(traceTM_aniceto.VectorizedSimulator(turing_machine), input_string, transitions, budget)
+                assert actual == expected, (turing_machine.transitions, input_string, budget)
+
+
+@pytest.mark.parametrize('seed', range(2))
+def test_parallel_matches_python(tmp_path, seed):
+    rng = random.Random(seed)
+    for _ in range(10):
+        turing_machine, transitions = random_machine(str(tmp_path), rng, deterministic=False)
+        for input_string in random_inputs(rng, 2, 6):
+            budget = rng.choice(BUDGETS)
+            expected = run(traceTM_aniceto.TuringMachineSimulator(turing_machine), input_string, transitions, budget)
+            # Split even the smallest levels into blocks of a few configurations, so the pool is always used
+            simulator = traceTM_aniceto.ParallelSimulator(turing_machine, workers=2, min_parallel=1,
+                                                          chunk_size=rng.choice([1, 3]))
+            actual = run(simulator, input_string, transitions, budget)
+            assert actual == expected, (turing_machine.transitions, input_string, budget)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_accelerated_matches_decide(tmp_path, seed):
+    rng = random.Random(seed)
+    for _ in range(40):
+        turing_machine, transitions = random_machine(str(tmp_path), rng, deterministic=True)
+        for input_string in random_inputs(rng, 3, 30):
+            for budget in BUDGETS + [{'max_depth': 3000, 'max_nodes': None}]:
+                simulator = traceTM_aniceto.TuringMachineSimulator(turing_machine)
+                expected = (simulator.decide(input_string, transitions, **budget), simulator.node_count,
+                            simulator.budget_exhausted)
+                accelerated = traceTM_aniceto.TuringMachineSimulator(turing_machine)
+                actual = accelerated.decide_accelerated(input_string, transitions, window=rng.choice([1, 2, 5, 16]),
+                                                        cache_size=rng.choice([1, 64, 4096]), **budget)
+                actual = (actual, accelerated.node_count, accelerated.budget_exhausted)
+                assert actual == expected, (turing_machine.transitions, input_string, budget)
+
+
+def test_accelerated_rejects_empty_window(tmp_path):
+    turing_machine, transitions = random_machine(str(tmp_path), random.Random(0), deterministic=True)
+    with pytest.raises(ValueError):
+        traceTM_aniceto.TuringMachineSimulator(turing_machine).decide_accelerated('01', transitions, window=0)
+
+
+@pytest.mark.parametrize('max_nodes', [2, 40, 41, 100, 1000])
+def test_parallel_node_budget_matches_python(tmp_path, max_nodes):
+    path = os.path.join(str(tmp_path), 'branching.csv')
+    with open(path, 'w') as opened_file:
+        # Every configuration branches three ways, so the node budget cuts a level in the middle of a block
+        opened_file.write('branching\nq0,qa,qr\n0,1\n0,1\nq0\nqa\nqr\n'
+                          'q0,0,q0,1,R\nq0,0,q0,0,L\nq0,0,q0,_,R\nq0,1,q0,0,R\nq0,1,q0,1,L\nq0,1,qr,1,R\n'
+                          'q0,_,q0,0,R\nq0,_,q0,1,R\nq0,_,q0,_,L\n')
+    turing_machine = traceTM_aniceto.NewTuringMachine(path)
+    transitions = turing_machine.compile_transitions()
+    budget = {'max_depth': None, 'max_nodes': max_nodes}
+    results = []
+    for simulator in (traceTM_aniceto.TuringMachineSimulator(turing_machine, traceTM_aniceto.SimulationStats()),
+                      traceTM_aniceto.ParallelSimulator(turing_machine, traceTM_aniceto.SimulationStats(), workers=2,
+                                                        min_parallel=1, chunk_size=4)):
+        result = run(simulator, '0110', transitions, budget)
+        stats = simulator.stats.as_dict()
+        stats.pop('phase_seconds')
+        results.append((result, stats))
+    assert results[0][0][3] == 'max-nodes'
+    assert results[1] == results[0]
@@ -0,0 +1,83 @@
+"""Behavior tests for the streaming output writer and the output formats of the command line."""
+import gzip
+import json
+import os
+import subprocess
+import sys
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, DIRECTORY)
+
+import traceTM_aniceto  # noqa: E402  (imported after extending the path)
+
+SCRIPT = os.path.join(DIRECTORY, 'traceTM_aniceto.py')
+CONTAINS010 = os.path.join(DIRECTORY, 'contains010.csv')
+
+
+def run_cli(*arguments, check=True):
+    """Run the command line on the contains010 machine and return the completed process."""
+    return subprocess.run([sys.executable, SCRIPT, CONTAINS010, *arguments], capture_output=True, text=True,
+                          check=check)
+
+
+def test_writer_appends_gzip_members(tmp_path, capsys):
+    path = os.path.join(str(tmp_path), 'trace.gz')
+    for run in range(2):
+        # A tiny buffer writes every line as its own chunk
+        with traceTM_aniceto.TraceWriter(path, compress=True, echo=False, buffer_size=8) as writer:
+            writer.write(f'run {run}')
+            writer.write_record({'step': run, 'state': 'q0'})
+    with gzip.open(path, 'rt') as opened_file:
+        assert opened_file.read().splitlines() == ['run 0', '{"step":0,"state":"q0"}', 'run 1',
+                                                   '{"step":1,"state":"q0"}']
+    assert capsys.readouterr().out == ''
+
+
+def test_writer_echoes_to_the_console(capsys):
+    with traceTM_aniceto.TraceWriter() as writer:
+        writer.write('first')
+        writer.write('second')
+        assert capsys.readouterr().out == ''
+    assert capsys.readouterr().out == 'first\nsecond\n'
+
+
+def test_cli_jsonl_trace_replays_the_path(tmp_path):
+    path = os.path.join(str(tmp_path), 'trace.jsonl.gz')
+    assert run_cli('010', '--format', 'jsonl', '--gzip', '--output', path, '--quiet').stdout == ''
+    with gzip.open(path, 'rt') as opened_file:
+        records = [json.loads(line) for line in opened_file]
+    assert records[0] == {'machine': 'contains010', 'input': '010', 'status': 'accepted', 'steps': 3,
+                          'transitions': 3}
+    steps = records[1:]
+    assert [record['step'] for record in steps] == [0, 1, 2, 3]
+    assert steps[0]['tape'] == '010'
+    # Replaying the written cells gives the tape of every step
+    tape = list(steps[0]['tape'])
+    for record in steps[1:]:
+        if 'cell' in record:
+            tape[record['cell']] = record['symbol']
+    assert ''.join(tape) == '010'
+    assert steps[-1]['state'] == 'q3'
+
+
+def test_cli_text_trace_is_appended(tmp_path):
+    path = os.path.join(str(tmp_path), 'trace.txt')
+    first = run_cli('010', '--output', path).stdout
+    run_cli('000', '--output', path, '--quiet')
+    with open(path) as opened_file:
+        written = opened_file.read()
+    assert written.startswith(first)
+    assert written[len(first):].splitlines()[2] == 'Input String: 000'
+
+
+def test_cli_batch_quiet_needs_an_output_file(tmp_path):
+    batch = os.path.join(str(tmp_path), 'inputs.txt')
+    with open(batch, 'w') as opened_file:
+        opened_file.write('010\n000\n')
+    rejected = run_cli('--batch', batch, '--quiet', check=False)
+    assert rejected.returncode == 2
+    assert '--quiet with --batch requires --output' in rejected.stderr
+    path = os.path.join(str(tmp_path), 'results.jsonl')
+    assert run_cli('--batch', batch, '--quiet', '--output', path).stdout == ''
+    with open(path) as opened_file:
+        assert [json.loads(line)['status'] for line in opened_file] == ['accepted', 'rejected']
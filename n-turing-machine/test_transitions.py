@@ -0,0 +1,46 @@
+"""Behavior tests for the compiled transition table and the transition counts it reports."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, DIRECTORY)
+
+import traceTM_aniceto  # noqa: E402  (imported after extending the path)
+
+SCRIPT = os.path.join(DIRECTORY, 'traceTM_aniceto.py')
+CONTAINS010 = os.path.join(DIRECTORY, 'contains010.csv')
+
+
+def summary(*arguments):
+    """Run the command line without an output file and return its summary lines, up to the verdict."""
+    output = subprocess.run([sys.executable, SCRIPT, CONTAINS010, *arguments, '--output', os.devnull],
+                            capture_output=True, text=True, check=True).stdout
+    return output.splitlines()[3:5]
+
+
+@pytest.mark.parametrize('input_string, expected', [
+    ('010', ['Total Transitions Traced: 3', 'String accepted in 3 steps']),
+    ('000', ['Total Transitions Traced: 4', 'String rejected in 3 steps']),
+    ('1111', ['Total Transitions Traced: 5', 'String rejected in 4 steps']),
+])
+def test_transitions_traced(input_string, expected):
+    assert summary(input_string) == expected
+
+
+def test_no_transitions_without_a_step():
+    assert summary('010', '--max-depth', '0')[0] == 'Total Transitions Traced: 0'
+
+
+def test_unknown_input_characters_share_one_symbol():
+    turing_machine = traceTM_aniceto.NewTuringMachine(CONTAINS010)
+    transitions = turing_machine.compile_transitions()
+    symbol_count = len(transitions.symbol_names)
+    # More distinct characters than a tape byte can hold, none of them in the alphabets
+    input_string = ''.join(chr(0x400 + i) for i in range(300))
+    tape = transitions.encode(input_string)
+    assert set(tape) == {transitions.unknown}
+    assert len(transitions.symbol_names) == symbol_count
+    assert transitions.decode(tape, input_string) == input_string
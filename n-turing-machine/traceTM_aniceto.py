@@ -1,5 +1,104 @@
 import collections  # Import the collections module for specialized container datatypes
 import argparse
+import contextlib
+import functools
+import gzip
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from array import array
+
+try:
+    import numpy as np  # Only needed by the vectorized engine
+except ImportError:
+    np = None
+
+# Status reported when a search budget runs out before the machine accepts or rejects
+UNDECIDED = 'undecided'
+
+# Checkpoint files start with this magic number and a fixed header
+CHECKPOINT_MAGIC = b'NTMCKPT1'
+CHECKPOINT_HEADER = struct.Struct('<8s20sqqqqqq??')
+# Number of frontier or visited values converted at a time when writing a checkpoint
+CHECKPOINT_CHUNK = 1 << 16
+
+# Define a class for collecting simulation metrics
+class SimulationStats:
+    """This class collects metrics of a simulation run: frontier sizes, lookups, tape growth, phase times and state hits."""
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.level_sizes = []                       # Frontier size of each expanded level
+        self.lookups = 0                            # Transition lookups (configurations expanded)
+        self.matched = 0                            # Lookups that found at least one rule
+        self.actions = 0                            # Transitions applied
+        self.tape_high_water = 0                    # Longest tape seen
+        self.phase_times = collections.Counter()    # Seconds spent per phase
+        self.state_hits = collections.Counter()     # Configurations expanded per state
+
+    def timed(self, name, items):
+        """Yield the items of an iterator, adding only the time spent producing them to the named phase."""
+        items = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            finally:
+                self.phase_times[name] += time.perf_counter() - start
+            yield item
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Add the wall-clock time spent in the body of the with-statement to the named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] += time.perf_counter() - start
+
+    def as_dict(self):
+        """
+        Return the metrics as a JSON-serializable dictionary.
+
+        Returns:
+        dict: The metrics, with the frontier of every level and the hit count of every state.
+        """
+        return {
+            'levels': len(self.level_sizes),
+            'level_sizes': self.level_sizes,
+            'max_frontier': max(self.level_sizes, default=0),
+            'lookups': self.lookups,
+            'matched': self.matched,
+            'actions': self.actions,
+            'tape_high_water': self.tape_high_water,
+            'phase_seconds': dict(self.phase_times),
+            'state_hits': dict(self.state_hits),
+        }
+
+    def format_lines(self):
+        """
+        Return the metrics as human-readable report lines.
+
+        Returns:
+        list: One string per metric.
+        """
+        lines = [
+            f'Levels Expanded: {len(self.level_sizes)} (largest frontier {max(self.level_sizes, default=0)})',
+            f'Transitions Tried: {self.lookups} lookups, {self.matched} matched, {self.actions} applied',
+            f'Tape High-Water Mark: {self.tape_high_water} cells',
+        ]
+        for name, seconds in self.phase_times.items():
+            lines.append(f'Phase {name}: {seconds * 1000:.3f} ms')
+        for state, hits in self.state_hits.most_common():
+            lines.append(f'State {state}: {hits} hits')
+        return lines
 
 # Define a class for a new Turing Machine
 class NewTuringMachine:
@@ -72,86 +171,949 @@ class NewTuringMachine:
                 transition_dict[state[0]].append(state[1:])
         return transition_dict  # Return the dictionary of transitions
 
+    def compile_transitions(self):
+        """
+        Compile the transition rules into an indexed lookup table.
+
+        States and tape symbols are interned to small integers and every rule is filed under its
+        `(state, symbol)` pair, so the simulator can find the applicable actions for a configuration
+        with a single dictionary lookup instead of scanning every rule of the state.
+
+        Returns:
+        CompiledTransitions: The indexed transition table of the Turing machine.
+        """
+        return CompiledTransitions(self)
+
+# Define a class holding the compiled transition table
+class CompiledTransitions:
+    """This class holds a Turing machine's transitions indexed by interned (state, symbol) pairs."""
+    # Symbol written on the tape when the head moves past the end of the input
+    BLANK = '_'
+    # Tapes store one symbol id per byte
+    MAX_SYMBOLS = 256
+    # Name shown for input characters outside the machine's alphabets when the input string is not at hand
+    UNKNOWN = '?'
+
+    def __init__(self, turing_machine):
+        """
+        Build the indexed transition table for the given Turing machine.
+
+        Parameters:
+        turing_machine (NewTuringMachine): The parsed Turing machine to compile.
+        """
+        self.state_ids = {}      # Map of state name -> state id
+        self.state_names = []    # Map of state id -> state name
+        self.symbol_ids = {}     # Map of tape symbol -> symbol id
+        self.symbol_names = []   # Map of symbol id -> tape symbol
+        self.table = {}          # Map of (state id, symbol id) -> tuple of actions
+
+        # Intern the declared states and symbols first so ids follow the machine definition
+        for state in turing_machine.states:
+            self.intern_state(state)
+        for symbol in list(turing_machine.input_alphabet) + list(turing_machine.tape_alphabet):
+            self.intern_symbol(symbol)
+        self.blank = self.intern_symbol(self.BLANK)
+        # Reserve one id, never interned by name, for all input characters outside the alphabets
+        self.unknown = len(self.symbol_names)
+        self.symbol_names.append(self.UNKNOWN)
+        self.start = self.intern_state(turing_machine.start_state)
+        self.accept = self.intern_state(turing_machine.accept_state[0])
+        self.reject = self.intern_state(turing_machine.reject_state[0])
+
+        actions = collections.defaultdict(list)
+        for rule in turing_machine.transitions:
+            # Skip malformed rules and rules for undeclared states
+            if len(rule) < 3 or rule[0] not in turing_machine.states:
+                continue
+            state, symbol, next_state = rule[0], rule[1], rule[2]
+            # Rules without a write symbol keep the symbol under the head
+            write = rule[3] if len(rule) > 3 else symbol
+            # The head moves right on 'R' and left otherwise
+            direction = 1 if len(rule) > 4 and rule[4] == 'R' else -1
+            key = (self.intern_state(state), self.intern_symbol(symbol))
+            actions[key].append((self.intern_state(next_state), self.intern_symbol(write), direction))
+        if len(self.symbol_names) > self.MAX_SYMBOLS:
+            raise ValueError(f'Turing machine uses more than {self.MAX_SYMBOLS - 1} tape symbols')
+        # Freeze the action lists so the table can be shared safely
+        self.table = {key: tuple(value) for key, value in actions.items()}
+
+    def intern_state(self, state):
+        """Return the id of a state name, assigning a new id if it has not been seen yet."""
+        if state not in self.state_ids:
+            self.state_ids[state] = len(self.state_names)
+            self.state_names.append(state)
+        return self.state_ids[state]
+
+    def intern_symbol(self, symbol):
+        """Return the id of a tape symbol, assigning a new id if it has not been seen yet."""
+        if symbol not in self.symbol_ids:
+            if len(self.symbol_names) >= self.MAX_SYMBOLS:
+                raise ValueError(f'Turing machine uses more than {self.MAX_SYMBOLS - 1} tape symbols')
+            self.symbol_ids[symbol] = len(self.symbol_names)
+            self.symbol_names.append(symbol)
+        return self.symbol_ids[symbol]
+
+    def encode(self, input_string):
+        """
+        Encode an input string as a tape of symbol ids.
+
+        Characters outside the machine's alphabets all share the reserved unknown symbol id, so the table
+        never grows with the inputs; no rule reads that symbol, so a configuration scanning one moves to the
+        reject state.
+
+        Parameters:
+        input_string (str): The input string for the Turing machine simulation.
+
+        Returns:
+        bytearray: The tape holding one symbol id per cell.
+        """
+        symbol_ids = self.symbol_ids
+        unknown = self.unknown
+        return bytearray([symbol_ids.get(symbol, unknown) for symbol in input_string])
+
+    def dense_tables(self):
+        """
+        Build the transition table as dense NumPy arrays indexed by (state id, symbol id, action).
+
+        A (state, symbol) pair without rules is given a single action into the reject state that leaves the
+        tape and head unchanged, so every configuration has at least one successor. The arrays are cached and
+        rebuilt if symbols were interned since they were built.
+
+        Returns:
+        dict: The arrays 'count' (actions per pair), 'next' (next state id), 'write' (symbol id written),
+              'move' (head movement) and 'cell' (1 if the action writes the tape, 0 for a miss).
+        """
+        shape = (len(self.state_names), len(self.symbol_names))
+        cached = getattr(self, 'dense_cache', None)
+        if cached is not None and cached['count'].shape == shape:
+            return cached
+        fanout = max((len(actions) for actions in self.table.values()), default=1)
+        count = np.ones(shape, dtype=np.int64)
+        next_state = np.full(shape + (fanout,), self.reject, dtype=np.int64)
+        write = np.zeros(shape + (fanout,), dtype=np.uint8)
+        move = np.zeros(shape + (fanout,), dtype=np.int64)
+        cell = np.zeros(shape + (fanout,), dtype=np.int64)
+        for (state, symbol), actions in self.table.items():
+            count[state, symbol] = len(actions)
+            for position, (action_state, action_write, direction) in enumerate(actions):
+                next_state[state, symbol, position] = action_state
+                write[state, symbol, position] = action_write
+                move[state, symbol, position] = direction
+                cell[state, symbol, position] = 1
+        self.dense_cache = {'count': count, 'next': next_state, 'write': write, 'move': move, 'cell': cell}
+        return self.dense_cache
+
+    def symbols(self, tape, input_string=''):
+        """
+        Return the symbol names of a tape of symbol ids.
+
+        No rule reads or writes the unknown symbol, so a cell holding it still holds its input character,
+        which is taken from `input_string` when given.
+
+        Parameters:
+        tape (bytes): The tape holding one symbol id per cell.
+        input_string (str): The input string the tape was encoded from, or '' to show unknown symbols as UNKNOWN.
+
+        Returns:
+        list: The name of the symbol in each cell.
+        """
+        symbol_names = self.symbol_names
+        cells = [symbol_names[symbol] for symbol in tape]
+        if self.unknown in tape:
+            for cell, symbol in enumerate(tape[:len(input_string)]):
+                if symbol == self.unknown:
+                    cells[cell] = input_string[cell]
+        return cells
+
+    def decode(self, tape, input_string=''):
+        """Return the string spelled by a tape of symbol ids, with the input characters for unknown symbols."""
+        return ''.join(self.symbols(tape, input_string))
+
+    def fingerprint(self):
+        """Return a digest of the states and the transition table, identifying the machine in checkpoints."""
+        return hashlib.sha1(repr((self.state_names, sorted(self.table.items()))).encode()).digest()
+
+# Define a class for one level of the computation tree
+class ComputationLevel:
+    """This class stores the configurations of one level of the computation tree as parallel arrays."""
+    __slots__ = ('parent', 'state', 'head', 'cell', 'old', 'new')
+
+    def __init__(self):
+        """
+        Initialize an empty level.
+
+        A configuration is stored as the index of its parent in the previous level, its state id, its
+        head position and the single tape cell its transition rewrote (cell, old symbol, new symbol).
+        The tape itself is not stored; it is rebuilt by replaying the deltas from the root.
+        """
+        self.parent = array('l')  # Index of the parent configuration in the previous level
+        self.state = array('l')   # State id of the configuration
+        self.head = array('l')    # Head position of the configuration
+        self.cell = array('l')    # Tape cell rewritten by the transition (-1 for none)
+        self.old = array('l')     # Symbol id the cell held before the transition
+        self.new = array('l')     # Symbol id the cell holds after the transition
+
+    def __len__(self):
+        """Return the number of configurations in the level."""
+        return len(self.state)
+
+    def append(self, parent, state, head, cell=-1, old=-1, new=-1):
+        """
+        Append a configuration to the level.
+
+        Parameters:
+        parent (int): Index of the parent configuration in the previous level (-1 for the root).
+        state (int): State id of the configuration.
+        head (int): Head position of the configuration.
+        cell (int): Tape cell rewritten by the transition, or -1 if the tape is unchanged.
+        old (int): Symbol id the cell held before the transition.
+        new (int): Symbol id the cell holds after the transition.
+
+        Returns:
+        int: The index of the new configuration within the level.
+        """
+        self.parent.append(parent)
+        self.state.append(state)
+        self.head.append(head)
+        self.cell.append(cell)
+        self.old.append(old)
+        self.new.append(new)
+        return len(self.state) - 1
+
+# Define a class for the computation tree
+class ComputationTree(list):
+    """This class is the list of computation levels, together with the input tape they replay from."""
+    def __init__(self, transitions, tape, input_string=''):
+        """
+        Initialize an empty computation tree.
+
+        Parameters:
+        transitions (CompiledTransitions): The transition table the tree was computed with.
+        tape (bytearray): The encoded input tape of the root configuration.
+        input_string (str): The input string the tape was encoded from, to show characters outside the alphabets.
+        """
+        super().__init__()
+        self.transitions = transitions  # Symbol and state names for formatting
+        self.tape = bytes(tape)         # Input tape of the root configuration
+        self.input_string = input_string
+        self.end = None                 # Position of the final configuration, once the search has ended
+
+    def path(self, height, index):
+        """
+        Return the positions of the configurations from the root down to a given configuration.
+
+        Parameters:
+        height (int): The level of the configuration.
+        index (int): The index of the configuration within its level.
+
+        Returns:
+        list: The (height, index) pairs of the path in root-to-leaf order.
+        """
+        positions = []
+        while height != -1 and index != -1:
+            positions.append((height, index))
+            index = self[height].parent[index]
+            height -= 1
+        positions.reverse()
+        return positions
+
+def cell_hash(cell, symbol, blank):
+    """
+    Return the contribution of one tape cell to the tape hash.
+
+    The tape hash is the XOR of the contributions of all cells (Zobrist hashing), so writing a cell
+    updates it in constant time. Blank cells contribute nothing, which makes a tape and the same tape
+    extended with blanks hash alike.
+
+    Parameters:
+    cell (int): The position of the cell.
+    symbol (int): The symbol id held by the cell.
+    blank (int): The symbol id of the blank symbol.
+
+    Returns:
+    int: The hash contribution of the cell.
+    """
+    return 0 if symbol == blank else hash((cell, symbol))
+
+def tape_hash(tape, blank):
+    """Return the hash of a whole tape of symbol ids."""
+    value = 0
+    for cell, symbol in enumerate(tape):
+        value ^= cell_hash(cell, symbol, blank)
+    return value
+
+def write_array(opened_file, values):
+    """
+    Write an array to a binary file as its typecode, item size and length followed by its raw items.
+
+    Parameters:
+    opened_file (file): The binary file to write to.
+    values (array): The array to write.
+    """
+    opened_file.write(struct.pack('<cBq', values.typecode.encode(), values.itemsize, len(values)))
+    values.tofile(opened_file)
+
+def write_items(opened_file, typecode, items, length):
+    """
+    Write `length` values from an iterable in the format of `write_array`.
+
+    The values are converted in chunks of CHECKPOINT_CHUNK items through one reused array, so no full copy
+    of a large frontier or visited set is built.
+
+    Parameters:
+    opened_file (file): The binary file to write to.
+    typecode (str): The typecode of the items.
+    items (iterable): The values to write; exactly `length` of them are taken.
+    length (int): The number of values.
+    """
+    chunk = array(typecode, bytes(array(typecode).itemsize * min(length, CHECKPOINT_CHUNK)))
+    opened_file.write(struct.pack('<cBq', typecode.encode(), chunk.itemsize, length))
+    items = iter(items)
+    while length > 0:
+        size = min(length, CHECKPOINT_CHUNK)
+        for position, value in enumerate(itertools.islice(items, size)):
+            chunk[position] = value
+        (chunk if size == len(chunk) else chunk[:size]).tofile(opened_file)
+        length -= size
+
+def read_array(opened_file, typecode='l'):
+    """
+    Read an array written by `write_array`.
+
+    Parameters:
+    opened_file (file): The binary file to read from.
+    typecode (str): The typecode of the returned array.
+
+    Returns:
+    array: The array, converted to `typecode` if it was written with another item type.
+    """
+    _, itemsize, length = struct.unpack('<cBq', opened_file.read(10))
+    # Read the items with a local typecode of the size they were written with
+    local_typecode = typecode
+    if array(typecode).itemsize != itemsize:
+        local_typecode = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}[itemsize]
+    values = array(local_typecode)
+    values.fromfile(opened_file, length)
+    return values if local_typecode == typecode else array(typecode, values)
+
+def write_checkpoint(path, fingerprint, tape, computation_tree, frontier, visited, depth, node_count, pruned_count,
+                     path_end, keep_tree):
+    """
+    Write the live state of a breadth-first search to a binary checkpoint file.
+
+    The file holds a fixed header, the input tape, the levels of the computation tree (all of them with
+    `keep_tree`, only the root otherwise), the frontier and, when deduplicating, the visited configurations.
+    Every record is a flat array preceded by its typecode, item size and length, so the file is written
+    straight from the level arrays and can be streamed or memory-mapped; the frontier and visited fields are
+    converted in fixed-size chunks. The file is replaced atomically. The search only calls this between
+    levels, so the progress within a level that is still being expanded is never saved.
+
+    Parameters:
+    path (str): Path of the checkpoint file.
+    fingerprint (bytes): The digest of the machine, from `CompiledTransitions.fingerprint`.
+    tape (bytearray): The input tape.
+    computation_tree (ComputationTree): The levels of the search so far.
+    frontier (list): The live configurations as (index, state, head, tape, hash) tuples.
+    visited (set): The (state, head, tape hash) configurations reached, or None without deduplication.
+    depth (int): The depth of the last level.
+    node_count (int): The number of configurations created.
+    pruned_count (int): The number of duplicate configurations pruned.
+    path_end (tuple): The (height, index) position the computation path currently ends in.
+    keep_tree (bool): Whether the checkpoint holds the whole computation tree.
+    """
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as opened_file:
+        opened_file.write(CHECKPOINT_HEADER.pack(CHECKPOINT_MAGIC, fingerprint, depth, node_count, pruned_count,
+                                                 path_end[0], path_end[1], len(computation_tree), keep_tree,
+                                                 visited is not None))
+        write_array(opened_file, array('B', tape))
+        for level in computation_tree:
+            for field in ComputationLevel.__slots__:
+                write_array(opened_file, getattr(level, field))
+        # Write the frontier and visited fields one at a time, without copying them into lists
+        for field, typecode in ((0, 'l'), (1, 'l'), (2, 'l'), (4, 'q')):
+            write_items(opened_file, typecode, (entry[field] for entry in frontier), len(frontier))
+        write_items(opened_file, 'q', (len(entry[3]) for entry in frontier), len(frontier))
+        for entry in frontier:
+            opened_file.write(entry[3])
+        if visited is not None:
+            for field in range(3):
+                write_items(opened_file, 'q', (key[field] for key in visited), len(visited))
+    os.replace(temporary_path, path)
+
+def read_checkpoint(path):
+    """
+    Read a checkpoint file written by `write_checkpoint`.
+
+    The whole frontier is rebuilt as a list of tuples, with one bytearray tape each, and the visited
+    configurations as a set, so resuming needs as much memory as the search had at the saved level.
+
+    Parameters:
+    path (str): Path of the checkpoint file.
+
+    Returns:
+    dict: The header fields ('fingerprint', 'depth', 'node_count', 'pruned_count', 'path_end', 'keep_tree',
+          'deduplicate'), the input 'tape', the tree 'levels', the 'frontier' tuples and the 'visited' set
+          (None without deduplication).
+    """
+    with open(path, 'rb') as opened_file:
+        (magic, fingerprint, depth, node_count, pruned_count, end_height, end_index, level_count, keep_tree,
+         deduplicate) = CHECKPOINT_HEADER.unpack(opened_file.read(CHECKPOINT_HEADER.size))
+        if magic != CHECKPOINT_MAGIC:
+            raise ValueError(f'{path} is not a Turing machine checkpoint')
+        tape = bytearray(read_array(opened_file, 'B'))
+        levels = []
+        for _ in range(level_count):
+            level = ComputationLevel()
+            for field in ComputationLevel.__slots__:
+                setattr(level, field, read_array(opened_file))
+            levels.append(level)
+        indices, states, heads = read_array(opened_file), read_array(opened_file), read_array(opened_file)
+        hashes, lengths = read_array(opened_file, 'q'), read_array(opened_file, 'q')
+        frontier = [(index, state, head, bytearray(opened_file.read(length)), hash_value)
+                    for index, state, head, hash_value, length in zip(indices, states, heads, hashes, lengths)]
+        visited = None
+        if deduplicate:
+            visited = set(zip(read_array(opened_file, 'q'), read_array(opened_file, 'q'), read_array(opened_file, 'q')))
+    return {'fingerprint': fingerprint, 'depth': depth, 'node_count': node_count, 'pruned_count': pruned_count,
+            'path_end': (end_height, end_index), 'keep_tree': keep_tree, 'deduplicate': deduplicate, 'tape': tape,
+            'levels': levels, 'frontier': frontier, 'visited': visited}
+
+def timed_items(name):
+    """
+    Decorate a simulator's generator method so that, with stats, the named phase counts only the time spent
+    producing its items and not the time the caller spends between them (writing the output, for example).
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            items = method(self, *args, **kwargs)
+            return self.stats.timed(name, items) if self.stats is not None else items
+        return wrapper
+    return decorate
+
 # Define a class for the Turing Machine Simulator
 class TuringMachineSimulator:
     """This class simulates the operation of a Turing machine using a computation tree."""
-    def __init__(self, turing_machine):
+    def __init__(self, turing_machine, stats=None, on_level=None, on_step=None):
         """
         Initialize the TuringMachineSimulator instance with a Turing machine.
 
         This constructor sets up the simulator with a specific Turing machine, preparing it for running simulations
-        based on the Turing machine's configuration.
+        based on the Turing machine's configuration. Metrics and callbacks are optional; when they are not given
+        the search only pays for a few `is None` checks.
 
         Parameters:
         turing_machine (NewTuringMachine): The Turing machine to be simulated.
+        stats (SimulationStats): Metrics to fill in during the simulation, or None.
+        on_level (callable): Called as on_level(depth, frontier_size) before each level is expanded, or None.
+        on_step (callable): Called as on_step(depth, state, head) for each configuration expanded, or None.
         """
         self.turing_machine = turing_machine  # Turing Machine to be simulated
+        self.stats = stats                    # Metrics collected during the simulation
+        self.on_level = on_level              # Callback run before each level
+        self.on_step = on_step                # Callback run for each configuration
+        self.budget_exhausted = None          # Name of the budget that ended the last run, if any
+        self.pruned_count = 0                 # Duplicate configurations pruned in the last run
+        self.computation_tree = None          # Computation tree of the last run, if it was kept
+        self.status = None                    # Final state of the last run, or UNDECIDED
+        self.steps = 0                        # Length of the computation path of the last run
+        self.node_count = 0                   # Configurations created in the last run
+        self.path_end = None                  # Position of the final configuration of the last run
+
+    def iter_search(self, input_string, transitions, keep_tree=False, max_depth=None, max_nodes=None,
+                    max_seconds=None, deduplicate=False, checkpoint=None, checkpoint_every=60.0, resume=False):
+        """
+        Search the computation tree of the Turing machine breadth-first, one level at a time.
+
+        This generator yields the progress of the search as it expands each level and stops the moment any
+        branch reaches the accept state. Once it is exhausted the outcome is available on the simulator:
+        `status` holds the accept or reject state (or UNDECIDED), `steps` the length of the computation path,
+        `node_count` the number of configurations created and `path_end` the (height, index) position of the
+        final configuration. The computation tree is only kept, in `computation_tree`, when `keep_tree` is set;
+        otherwise each level is dropped once the next one is built.
+
+        The level loop, the budgets, the checkpoints and the termination checks are shared by all engines;
+        an engine only provides `start_frontier`, `frontier_size` and `expand_level`. This class expands
+        one configuration at a time and yields each of them as it is expanded.
+
+        The search can be bounded by a depth, node and time budget to prevent infinite loops; when a budget
+        runs out the run ends with the UNDECIDED status and `budget_exhausted` names the budget that was hit.
+        A level that accepts before the node budget cuts it is not counted as a budget stop.
+
+        With `deduplicate` enabled, a live configuration (state, head and tape) that was already reached is
+        pruned instead of being expanded again; the first parent reaching it is kept for path reconstruction,
+        and `pruned_count` reports how many configurations were dropped. Configurations are compared by a
+        tape hash that is updated incrementally on every write.
+
+        The tree only stores one compact record per configuration; the tapes of the live frontier are kept
+        alongside the search and are copied only when a configuration branches.
+
+        With a `checkpoint` path, the levels, frontier and counters are written to that file between levels
+        every `checkpoint_every` seconds, and again when a depth or time budget runs out; the file is removed
+        once the machine accepts or rejects. With `resume`, an existing checkpoint is loaded and the search
+        continues from it; the depth and node budgets count from the start of the original search.
+
+        Parameters:
+        input_string (str): The input string for the Turing machine simulation.
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        keep_tree (bool): Whether to keep the whole computation tree for path reconstruction.
+        max_depth (int): Maximum number of levels to expand, or None for no limit.
+        max_nodes (int): Maximum number of configurations to create, or None for no limit.
+        max_seconds (float): Maximum wall-clock time of the search, checked between levels, or None for no limit.
+        deduplicate (bool): Whether to prune configurations that were already reached.
+        checkpoint (str): Path of the checkpoint file, or None for no checkpoints.
+        checkpoint_every (float): Seconds between checkpoints.
+        resume (bool): Whether to continue from the checkpoint file if it exists.
+
+        Yields:
+        tuple: The progress items of `expand_level`; here the (depth, index, state id, head) of each
+               configuration as it is expanded.
+        """
+        tape = transitions.encode(input_string)
+        computation_tree = ComputationTree(transitions, tape, input_string)
+        root = ComputationLevel()
+        root.append(-1, transitions.start, 0)
+        computation_tree.append(root)
+        blank = transitions.blank
+        reject = transitions.reject
+        root_hash = tape_hash(tape, blank) if deduplicate else 0
+        # Live configurations of the last level, in the engine's own representation
+        frontier = self.start_frontier(transitions, tape, root_hash)
+        # Configurations reached so far, keyed by (state, head, tape hash)
+        visited = {(transitions.start, 0, root_hash)} if deduplicate else None
+        deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+        self.computation_tree = computation_tree if keep_tree else None
+        self.budget_exhausted = None
+        self.pruned_count = 0
+        self.node_count = 1  # Number of configurations created
+        self.path_end = (0, 0)  # Position of the final configuration of the computation path
+        status = self.turing_machine.reject_state[0]
+        depth = 0  # Depth of the last level
+        fingerprint = transitions.fingerprint() if checkpoint is not None else None
+
+        def save_checkpoint():
+            write_checkpoint(checkpoint, fingerprint, computation_tree.tape, computation_tree, frontier, visited,
+                             depth, self.node_count, self.pruned_count, self.path_end, keep_tree)
+
+        if resume and checkpoint is not None and os.path.exists(checkpoint):
+            # Continue from the levels, frontier and counters saved in the checkpoint
+            saved = read_checkpoint(checkpoint)
+            if saved['fingerprint'] != fingerprint or saved['tape'] != tape:
+                raise ValueError(f'{checkpoint} was written for another machine or input string')
+            if saved['deduplicate'] != deduplicate:
+                raise ValueError(f'{checkpoint} was written with a different deduplication setting')
+            if keep_tree and not saved['keep_tree']:
+                raise ValueError(f'{checkpoint} does not hold the computation tree')
+            computation_tree[:] = saved['levels'] if keep_tree else saved['levels'][:1]
+            frontier, visited, depth = saved['frontier'], saved['visited'], saved['depth']
+            self.node_count, self.pruned_count, self.path_end = (saved['node_count'], saved['pruned_count'],
+                                                                 saved['path_end'])
+        next_checkpoint = time.monotonic() + checkpoint_every
+
+        if transitions.start == transitions.accept:
+            status = self.turing_machine.accept_state[0]
+        try:
+            # Loop to simulate the Turing machine computation until it halts or a budget runs out
+            while self.frontier_size(frontier):
+                if max_depth is not None and depth >= max_depth:
+                    self.budget_exhausted = 'max-depth'
+                elif deadline is not None and time.monotonic() >= deadline:
+                    self.budget_exhausted = 'max-seconds'
+                if self.budget_exhausted:
+                    status = UNDECIDED
+                    break
+                if checkpoint is not None and time.monotonic() >= next_checkpoint:
+                    save_checkpoint()
+                    next_checkpoint = time.monotonic() + checkpoint_every
+                depth += 1
+                if self.stats is not None:
+                    self.stats.level_sizes.append(self.frontier_size(frontier))
+                if self.on_level is not None:
+                    self.on_level(depth - 1, self.frontier_size(frontier))
+                current_level, frontier, accepted, truncated = yield from self.expand_level(
+                    transitions, frontier, depth, max_nodes, visited)
+                # Append the current level to the computation tree, unless the node budget left it empty
+                if keep_tree and len(current_level):
+                    computation_tree.append(current_level)
+                self.node_count += len(current_level)
+
+                # Check for termination conditions
+                if accepted:
+                    # The accepting configuration is the last one of its level
+                    self.path_end = (depth, len(current_level) - 1)
+                    status = self.turing_machine.accept_state[0]  # Accept state reached
+                    break
+                if len(current_level):
+                    # The path ends in the last configuration, or in its parent if that is a reject
+                    last_index = len(current_level) - 1
+                    if current_level.state[last_index] == reject:
+                        self.path_end = (depth - 1, current_level.parent[last_index])
+                    else:
+                        self.path_end = (depth, last_index)
+                if truncated:
+                    self.budget_exhausted = 'max-nodes'
+                    status = UNDECIDED  # Node budget ran out in the middle of the level
+                    break
+        finally:
+            self.end_search()
+
+        if checkpoint is not None:
+            if status != UNDECIDED:
+                # A finished search has nothing left to resume
+                if os.path.exists(checkpoint):
+                    os.remove(checkpoint)
+            elif self.budget_exhausted != 'max-nodes':
+                # Save the last complete level so the search can be resumed with a larger budget
+                save_checkpoint()
+        self.status = status
+        self.steps = self.path_end[0]
+        computation_tree.end = self.path_end
+
+    def start_frontier(self, transitions, tape, root_hash):
+        """
+        Return the frontier holding the start configuration, or an empty one if the start state halts.
+
+        Parameters:
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        tape (bytearray): The encoded input tape.
+        root_hash (int): The tape hash of the input, or 0 without deduplication.
+
+        Returns:
+        list: The live configurations as (index, state, head, tape, hash) tuples.
+        """
+        if transitions.start in (transitions.accept, transitions.reject):
+            return []
+        return [(0, transitions.start, 0, tape, root_hash)]
+
+    def frontier_size(self, frontier):
+        """Return the number of live configurations in a frontier."""
+        return len(frontier)
+
+    def end_search(self):
+        """Release the resources of a search once it has ended; this engine holds none."""
+
+    def expand_level(self, transitions, frontier, depth, max_nodes, visited):
+        """
+        Expand every configuration of the frontier into the next level, one configuration at a time.
+
+        The expansion stops at the first configuration reaching the accept state, or before the first
+        configuration that would be expanded once the search created `max_nodes` configurations.
+
+        Parameters:
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        frontier (list): The live configurations of the last level, as built by `start_frontier`.
+        depth (int): The depth of the level being built.
+        max_nodes (int): Maximum number of configurations to create, or None for no limit.
+        visited (set): The (state, head, tape hash) configurations reached, or None without deduplication.
+
+        Yields:
+        tuple: The (depth, index, state id, head) of each configuration as it is expanded.
+
+        Returns:
+        tuple: The new ComputationLevel, the next frontier, whether the level accepted and whether the node
+               budget cut the level.
+        """
+        table = transitions.table
+        blank = transitions.blank
+        accept = transitions.accept
+        reject = transitions.reject
+        halting_states = (accept, reject)
+        deduplicate = visited is not None
+        stats, on_step = self.stats, self.on_step
+        state_names = transitions.state_names
+        current_level = ComputationLevel()  # Current level in computation tree
+        next_frontier = []  # Live configurations of the current level
+        # Iterate through each live configuration of the last level
+        for track_pindex, node, str_index, tape, hash_value in frontier:
+            # Stop expanding once the search created as many configurations as allowed
+            if max_nodes is not None and self.node_count + len(current_level) >= max_nodes:
+                return current_level, next_frontier, False, True
+            yield depth - 1, track_pindex, node, str_index
+
+            # Extend the tape with a blank symbol if needed
+            if str_index >= len(tape):
+                tape.append(blank)
+            symbol = tape[str_index]
+            # Look up the actions for the current state and the symbol under the head
+            actions = table.get((node, symbol))
+            if stats is not None:
+                stats.lookups += 1
+                stats.state_hits[state_names[node]] += 1
+                if len(tape) > stats.tape_high_water:
+                    stats.tape_high_water = len(tape)
+                if actions:
+                    stats.matched += 1
+                    stats.actions += len(actions)
+            if on_step is not None:
+                on_step(depth - 1, state_names[node], str_index)
+            if not actions:
+                # If no rule matches, transition straight to the reject state
+                current_level.append(track_pindex, reject, str_index)
+                continue
+            last_action = len(actions) - 1
+            for position, (next_state, write, direction) in enumerate(actions):
+                # The head never moves off the left end of the tape
+                head = str_index + direction if str_index + direction >= 0 else 0
+                child_hash = hash_value
+                if deduplicate and next_state not in halting_states:
+                    # Update the tape hash for the written cell and skip configurations already reached
+                    child_hash ^= cell_hash(str_index, symbol, blank) ^ cell_hash(str_index, write, blank)
+                    key = (next_state, head, child_hash)
+                    if key in visited:
+                        self.pruned_count += 1
+                        continue
+                    visited.add(key)
+                index = current_level.append(track_pindex, next_state, head, str_index, symbol, write)
+                if next_state == accept:
+                    # Stop the moment any branch accepts
+                    return current_level, next_frontier, True, False
+                if next_state != reject:
+                    # Only branching transitions need their own copy of the tape
+                    child_tape = tape if position == last_action else bytearray(tape)
+                    child_tape[str_index] = write
+                    next_frontier.append((index, next_state, head, child_tape, child_hash))
+        return current_level, next_frontier, False, False
 
     # Method to compute the computation tree of the Turing machine
-    def compute_tree(self, input_string, states_map):
+    def compute_tree(self, input_string, transitions, max_depth=None, max_nodes=None, max_seconds=None,
+                     deduplicate=False, checkpoint=None, checkpoint_every=60.0, resume=False):
         """
         Compute the computation tree of the Turing machine for a given input string.
 
-        This method simulates the operation of the Turing machine on an input string and constructs a computation
-        tree that represents the transitions of the machine's states. The method limits the depth of the computation
-        to prevent infinite loops.
+        This method runs `iter_search` to completion while keeping the whole computation tree, so the path
+        to the final configuration can be traced and printed afterwards.
 
         Parameters:
         input_string (str): The input string for the Turing machine simulation.
-        states_map (dict): A dictionary of states and their corresponding transitions.
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        max_depth (int): Maximum number of levels to expand, or None for no limit.
+        max_nodes (int): Maximum number of configurations in the tree, or None for no limit.
+        max_seconds (float): Maximum wall-clock time of the search, checked between levels, or None for no limit.
+        deduplicate (bool): Whether to prune configurations that were already reached.
+        checkpoint (str): Path of the checkpoint file, or None for no checkpoints.
+        checkpoint_every (float): Seconds between checkpoints.
+        resume (bool): Whether to continue from the checkpoint file if it exists.
 
         Returns:
-        list or tuple: A computation tree representing the Turing machine's operation, and the final state 
-                    (accept or reject) if reached within the depth limit.
-        """
-        computation_tree = [[[self.turing_machine.start_state, -1, -1, input_string, 0]]]
-        depth = -1  # Initialize depth of computation
-
-        # Loop to simulate the Turing machine computation for a limited depth (max 15)
-        while depth < 15:
-            depth += 1  # Increment depth
-            current_level = []  # Current level in computation tree
-            next_node = 'na'  # Placeholder for the next node
-            # Iterate through each state in the last level of the computation tree
-            for track_pindex, state in enumerate(computation_tree[-1]):
-                node, pheight, pindex, input_string, str_index = state
-
-                # Check transitions for the current state
-                for child in states_map[node]:
-                    # Extend input string with a blank symbol if needed
-                    if str_index >= len(input_string):
-                        input_string += '_'
-                    # Check for a matching transition
-                    if child[0] == input_string[str_index]:  # Match found
-                        # Save original input string for later restoration
-                        temp = input_string
-                        # Convert string to list for manipulation
-                        input_string = list(input_string)
-                        # Apply the transition (write symbol)
-                        input_string[str_index] = child[2] if len(child) >= 3 else input_string[str_index]
-                        # Convert list back to string
-                        input_string = ''.join(input_string)
-                        # Determine the direction of head movement
-                        direction = 1 if len(child) >= 3 and child[3] == 'R' else -1
-                        next_node = child[1]  # Next state
-                        # Append new state to the current level of computation tree
-                        current_level.append([next_node, len(computation_tree) - 1, track_pindex, input_string, str_index + direction])
-                        # Restore original input string for the next iteration
-                        input_string = temp
-                    else:
-                        # If no match, transition to reject state
-                        current_level.append([self.turing_machine.reject_state[0], len(computation_tree) - 1, track_pindex, input_string, str_index])
-            # Append the current level to the computation tree
-            computation_tree.append(current_level)
-
-            # Check for termination conditions
-            if computation_tree[-1] == []:
-                return self.turing_machine.reject_state  # No further states to process
-            if next_node == self.turing_machine.accept_state[0]:
-                return computation_tree, self.turing_machine.accept_state[0]  # Accept state reached
-            elif next_node == 'na':
-                return computation_tree, self.turing_machine.reject_state[0]  # No applicable transition (reject)
-        return computation_tree  # Return the computation tree if depth limit reached
+        tuple: A computation tree representing the Turing machine's operation, and the final state 
+               (accept or reject), or UNDECIDED if a budget ran out first.
+        """
+        with self.phase('search'):
+            collections.deque(self.iter_search(input_string, transitions, True, max_depth, max_nodes, max_seconds,
+                                               deduplicate, checkpoint, checkpoint_every, resume), maxlen=0)
+        return self.computation_tree, self.status
+
+    def decide(self, input_string, transitions, max_depth=None, max_nodes=None, max_seconds=None,
+               deduplicate=False, checkpoint=None, checkpoint_every=60.0, resume=False):
+        """
+        Decide whether the Turing machine accepts an input string without keeping the computation tree.
+
+        Parameters:
+        input_string (str): The input string for the Turing machine simulation.
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        max_depth (int): Maximum number of levels to expand, or None for no limit.
+        max_nodes (int): Maximum number of configurations to create, or None for no limit.
+        max_seconds (float): Maximum wall-clock time of the search, checked between levels, or None for no limit.
+        deduplicate (bool): Whether to prune configurations that were already reached.
+        checkpoint (str): Path of the checkpoint file, or None for no checkpoints.
+        checkpoint_every (float): Seconds between checkpoints.
+        resume (bool): Whether to continue from the checkpoint file if it exists.
+
+        Returns:
+        tuple: The final state (accept or reject), or UNDECIDED, and the number of steps of the computation path.
+        """
+        with self.phase('search'):
+            collections.deque(self.iter_search(input_string, transitions, False, max_depth, max_nodes, max_seconds,
+                                               deduplicate, checkpoint, checkpoint_every, resume), maxlen=0)
+        return self.status, self.steps
+
+    def decide_accelerated(self, input_string, transitions, max_depth=None, max_nodes=None, max_seconds=None,
+                           window=8, cache_size=65536):
+        """
+        Decide a deterministic Turing machine with memoized macro steps.
+
+        Instead of one transition at a time, the machine is run on the tape window of `window` cells on each
+        side of the head until the head leaves the window or the machine halts. The outcome of such a macro
+        step (next state, new window contents, head offset and number of steps) is cached in a bounded LRU
+        cache keyed by the state and the window contents, so the repeated sweeps of counters and similar
+        machines are replayed in one lookup. Step counts, node counts and budgets are exactly those of
+        `decide`; no computation tree is kept.
+
+        Parameters:
+        input_string (str): The input string for the Turing machine simulation.
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        max_depth (int): Maximum number of steps to run, or None for no limit.
+        max_nodes (int): Maximum number of configurations to create, or None for no limit.
+        max_seconds (float): Maximum wall-clock time of the run, checked between macro steps, or None for no limit.
+        window (int): Number of tape cells on each side of the head in a macro step.
+        cache_size (int): Maximum number of macro steps kept in the cache.
+
+        Returns:
+        tuple: The final state (accept or reject), or UNDECIDED, and the number of steps of the computation path.
+        """
+        if window < 1:
+            raise ValueError('the macro-step window must be at least 1 cell')
+        if cache_size < 0:
+            raise ValueError('the macro-step cache size must not be negative')
+        if any(len(actions) > 1 for actions in transitions.table.values()):
+            raise ValueError('macro-step acceleration requires a deterministic machine')
+        table = {key: actions[0] for key, actions in transitions.table.items() if actions}
+        blank = transitions.blank
+        accept = transitions.accept
+        reject = transitions.reject
+        macro_limit = 8 * window  # Steps after which a macro step ends even if the head stays in the window
+        stats = self.stats
+
+        def run_window(state, left, at_edge, cells, limit):
+            # Run the machine on a window of cells with the head `left` cells from its start. With stats, the
+            # result also carries the rightmost cell looked up and the lookups of each state, so cached macro
+            # steps report the same counters as the python engine
+            cells = bytearray(cells)
+            position = left
+            steps = 0
+            reach = position
+            hits = collections.Counter() if stats is not None else None
+            outcome = None
+            while steps < limit:
+                if hits is not None:
+                    hits[state] += 1
+                    if position > reach:
+                        reach = position
+                action = table.get((state, cells[position]))
+                if action is None:
+                    outcome = 'miss'
+                    break
+                state, cells[position], direction = action
+                steps += 1
+                position += direction
+                if state == accept or state == reject:
+                    outcome = 'halt'
+                    position = max(position, 0)
+                    break
+                if position < 0:
+                    if not at_edge:
+                        break
+                    position = 0  # The head never moves off the left end of the tape
+                elif position == len(cells):
+                    break
+            hits = tuple(hits.items()) if hits is not None else ()
+            return state, bytes(cells), position, steps, outcome, reach, hits
+
+        macro_step = functools.lru_cache(maxsize=cache_size)(
+            lambda state, left, at_edge, cells: run_window(state, left, at_edge, cells, macro_limit))
+
+        # A node budget of n configurations allows n - 1 steps of a deterministic machine
+        step_limit, budget = max_depth, 'max-depth'
+        if max_nodes is not None and (step_limit is None or max_nodes - 1 < step_limit):
+            step_limit, budget = max(max_nodes - 1, 0), 'max-nodes'
+        deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+        tape = transitions.encode(input_string)
+        state = transitions.start
+        head = 0
+        steps = 0
+        outcome = 'halt' if state in (accept, reject) else None
+        self.budget_exhausted = None
+        self.pruned_count = 0
+        self.macro_steps = 0
+        lookups = 0
+        reach = -1
+        state_hits = collections.Counter()
+
+        with self.phase('search'):
+            while outcome is None:
+                if step_limit is not None and steps >= step_limit:
+                    self.budget_exhausted = budget
+                elif deadline is not None and time.monotonic() >= deadline:
+                    self.budget_exhausted = 'max-seconds'
+                if self.budget_exhausted:
+                    break
+                left = head if head < window else window
+                start = head - left
+                end = head + window + 1
+                if end > len(tape):
+                    tape.extend(bytes([blank]) * (end - len(tape)))
+                cells = bytes(tape[start:end])
+                if step_limit is not None and step_limit - steps < macro_limit:
+                    # Near the step budget, run exactly up to it without caching
+                    result = run_window(state, left, start == 0, cells, step_limit - steps)
+                else:
+                    result = macro_step(state, left, start == 0, cells)
+                state, cells, position, count, outcome, cell, hits = result
+                tape[start:end] = cells
+                head = start + position
+                steps += count
+                self.macro_steps += 1
+                if stats is not None:
+                    # Every step and a final missing rule each took one lookup in a level of one configuration
+                    lookups += count + (outcome == 'miss')
+                    reach = max(reach, start + cell)
+                    state_hits.update(dict(hits))
+            if stats is not None:
+                # A level cut by the node budget is counted although none of it was looked up
+                stats.level_sizes.extend([1] * (lookups + (self.budget_exhausted == 'max-nodes')))
+                stats.lookups += lookups
+                stats.matched += steps
+                stats.actions += steps
+                if lookups:
+                    # The tape padding of the windows is not counted, only the input and the cells looked up
+                    stats.tape_high_water = max(stats.tape_high_water, len(input_string), reach + 1)
+                for state_id, hits in state_hits.items():
+                    stats.state_hits[transitions.state_names[state_id]] += hits
+
+        self.cache_info = macro_step.cache_info()
+        self.node_count = steps + 1
+        if outcome == 'miss':
+            # A missing rule adds one reject configuration after the last step
+            self.node_count += 1
+        if self.budget_exhausted:
+            self.status = UNDECIDED
+        elif state == accept:
+            self.status = self.turing_machine.accept_state[0]
+        else:
+            self.status = self.turing_machine.reject_state[0]
+            if outcome == 'halt' and steps:
+                steps -= 1  # The path of an explicit reject ends in the configuration before it
+        self.steps = steps
+        self.path_end = None
+        self.computation_tree = None
+        return self.status, self.steps
+
+    def phase(self, name):
+        """Return a context manager timing the named phase into the stats, or a no-op one without stats."""
+        return self.stats.phase(name) if self.stats is not None else contextlib.nullcontext()
+
+    def find_path_end(self, computation_tree):
+        """
+        Locate the configuration the reported computation path ends in.
+
+        A tree computed by `iter_search` records this position itself. Otherwise this is the first accept
+        configuration of the deepest level that contains one or, when no branch accepted, the last configuration
+        in the tree (its parent if that configuration is a reject).
+
+        Parameters:
+        computation_tree (ComputationTree): The computation tree of the Turing machine.
+
+        Returns:
+        tuple: The (height, index) position of the final configuration of the path.
+        """
+        if computation_tree.end is not None:
+            return computation_tree.end
+        accept = computation_tree.transitions.accept
+        # Iterate backwards through the computation tree looking for an accept state
+        for height in range(len(computation_tree) - 1, -1, -1):
+            states = computation_tree[height].state
+            if accept in states:
+                return height, states.index(accept)
+        height = len(computation_tree) - 1
+        if not len(computation_tree[height]):
+            # A search stopped before any configuration of its last level was expanded
+            height -= 1
+        last_level = computation_tree[height]
+        last_index = len(last_level) - 1
+        if last_level.state[last_index] == computation_tree.transitions.reject:
+            return height - 1, last_level.parent[last_index]
+        return height, last_index
 
     # Method to calculate the path length in the computation tree
     def compute_path_len(self, computation_tree):
@@ -162,98 +1124,99 @@ class TuringMachineSimulator:
         tree, calculating the length of this path.
 
         Parameters:
-        computation_tree (list of lists): The computation tree of the Turing machine.
+        computation_tree (ComputationTree): The computation tree of the Turing machine.
 
         Returns:
-        list: The path from the accept state to the start state in reverse order.
-        """
-        path = []  # List to store the path
-        flag = False  # Flag to indicate if accept state is found
-        # Start from the last node in the computation tree
-        height, index = computation_tree[-1][-1][1], computation_tree[-1][-1][2]
-        # Iterate backwards through the computation tree
-        for level in computation_tree[::-1]:
-            for state in level:
-                # Check if current state is an accept state
-                if state[0] == self.turing_machine.accept_state[0]:
-                    # Update height and index to trace back the path
-                    height, index = state[1], state[2]
-                    # Append the accept state to the path
-                    path.append(self.turing_machine.accept_state[0])
-                    flag = True  # Set flag to indicate accept state found
-                    break
-            # Break out of the loop if accept state is found
-            if flag:
-                break
-        # Trace back the path from the accept state to the start state
-        while height != -1 and index != -1:
-            # Append each state in the path
-            path.append(computation_tree[height][index][0])
-            # Update height and index for the previous state
-            height, index = computation_tree[height][index][1], computation_tree[height][index][2]
-        return path[::-1]  # Return the path in the correct order
+        list: The states on the path from the start state to the final state.
+        """
+        with self.phase('path'):
+            state_names = computation_tree.transitions.state_names
+            height, index = self.find_path_end(computation_tree)
+            return [state_names[computation_tree[level].state[position]]
+                    for level, position in computation_tree.path(height, index)]
+
+    @timed_items('format')
+    def iter_output(self, computation_tree):
+        """
+        Generate the formatted configurations of the computation path, from the start configuration to the final one.
+
+        This method locates the accept configuration (or the end of the rejecting path) and replays the tape
+        deltas along the path from the root, formatting each configuration with the current state inserted
+        in front of the symbol under the head. The tape is kept as a list of symbol names that is updated in
+        place, so each line is built with a single join.
+
+        Parameters:
+        computation_tree (ComputationTree): The computation tree of the Turing Machine.
+
+        Yields:
+        str: The formatted configuration of each step of the computation path.
+        """
+        transitions = computation_tree.transitions
+        state_names = transitions.state_names
+        symbol_names = transitions.symbol_names
+        blank = symbol_names[transitions.blank]
+        height, index = self.find_path_end(computation_tree)
+        cells = transitions.symbols(computation_tree.tape, computation_tree.input_string)
+        # Replay the path from the root, applying each configuration's tape delta
+        for level, position in computation_tree.path(height, index):
+            level = computation_tree[level]
+            cell = level.cell[position]
+            if cell != -1:
+                # Cells past the end of the tape are blank until written
+                if cell >= len(cells):
+                    cells.extend([blank] * (cell + 1 - len(cells)))
+                cells[cell] = symbol_names[level.new[position]]
+            # Insert the current state in front of the symbol under the head
+            head = level.head[position]
+            cells.insert(head, f'[{state_names[level.state[position]]}]')
+            yield ''.join(cells)
+            del cells[head]
+
+    @timed_items('format')
+    def iter_records(self, computation_tree):
+        """
+        Generate the steps of the computation path as compact records, from the start configuration to the final one.
+
+        The first record holds the input tape; every record holds the state and head position, and the cell
+        and symbol written by its transition if it wrote one, so the tape of each step can be replayed.
+
+        Parameters:
+        computation_tree (ComputationTree): The computation tree of the Turing Machine.
+
+        Yields:
+        dict: The 'step', 'state' and 'head' of each configuration, with 'cell' and 'symbol' for a write and
+              'tape' for the start configuration.
+        """
+        transitions = computation_tree.transitions
+        state_names = transitions.state_names
+        symbol_names = transitions.symbol_names
+        height, index = self.find_path_end(computation_tree)
+        for step, (level, position) in enumerate(computation_tree.path(height, index)):
+            level = computation_tree[level]
+            record = {'step': step, 'state': state_names[level.state[position]], 'head': level.head[position]}
+            if step == 0:
+                record['tape'] = transitions.decode(computation_tree.tape, computation_tree.input_string)
+            if level.cell[position] != -1:
+                record['cell'] = level.cell[position]
+                record['symbol'] = symbol_names[level.new[position]]
+            yield record
 
     # Method to configure the output based on the computation tree
     def set_output(self, computation_tree):
         """
         Configures and returns the output of a Turing Machine based on its computation tree.
 
-        This method traverses the computation tree of the Turing Machine in reverse. It looks for the 
-        accept state, then formats and collects the output from the computation tree based on the 
-        transitions and states encountered.
+        This method collects the lines of `iter_output`, which streams them in root-to-leaf order instead.
 
         Parameters:
-        computation_tree (list of lists): A nested list representing the computation tree of the Turing Machine.
-                                          Each element in this nested list represents a state with its details.
+        computation_tree (ComputationTree): The computation tree of the Turing Machine.
 
         Returns:
-        list: A list of strings representing the formatted output of the Turing Machine's computation.
-        """
-        # Initialize an empty list to store the output.
-        output_list = []
-        # A flag used to break out of nested loops when a condition is met.
-        flag = False
-        # Initialize an empty list to store the answer.
-        ans = []
-        # Extract the height and index of the last element in the computation tree.
-        height, index = computation_tree[-1][-1][1], computation_tree[-1][-1][2]
-
-        # Iterate in reverse through the computation tree.
-        for level in computation_tree[::-1]:
-            for state in level:
-                # Check if the current state is the Turing Machine's accept state.
-                if state[0] == self.turing_machine.accept_state[0]:
-                    # Update height and index to the current state's position.
-                    height, index = state[1], state[2]
-                    # Add the formatted state information to 'ans' list.
-                    ans.append(state[3][:state[4]] + f'[{state[0]}]' + state[3][state[4]:])
-                    # Add the accept state to 'output_list'.
-                    output_list.append(self.turing_machine.accept_state[0])
-                    # Set the flag to True to indicate the accept state was found.
-                    flag = True
-                    break
-            # If the accept state was found, exit the outer loop.
-            if flag:
-                break
-
-        # Iterate through the computation tree based on the updated height and index.
-        while height != -1 and index != -1:
-            # Extract the head position, current string, and current state.
-            head = computation_tree[height][index][4]
-            cur_string = computation_tree[height][index][3]
-            cur_state = computation_tree[height][index][0]
-            # Format the output based on the position of the head.
-            if head == 0:
-                output = f'[{cur_state}]' + cur_string
-            else:
-                output = cur_string[:head] + f'[{cur_state}]' + cur_string[head:]
-            # Add the formatted output to 'ans' list.
-            ans.append(output)
-            # Add the current state to 'output_list'.
-            output_list.append(computation_tree[height][index][0])
-            # Update height and index for the next iteration.
-            height, index = computation_tree[height][index][1], computation_tree[height][index][2]
-        # Return the list containing the formatted output.
+        list: A list of strings representing the formatted output of the Turing Machine's computation,
+              from the final configuration back to the start configuration.
+        """
+        ans = list(self.iter_output(computation_tree))
+        ans.reverse()
         return ans
 
 
@@ -265,22 +1228,684 @@ class TuringMachineSimulator:
         the total number of transitions that have occurred during the computation process.
 
         Parameters:
-        computation_tree (list of lists): A nested list representing the computation tree of the Turing Machine.
-                                          Each element in this nested list represents a state with its details.
+        computation_tree (ComputationTree): The computation tree of the Turing Machine.
 
         Returns:
         int: The total number of transitions in the Turing Machine's computation tree.
         """
-        # Initialize a counter for the number of transitions.
-        size = 0
-        # Iterate through each level of the computation tree.
-        for level in computation_tree:
-            # Iterate through each node in the current level.
-            for node in level:
-                # Increment the counter for each node (transition).
-                size += 1
-        # Return the total count of transitions.
-        return size
+        # Count each node of every level as one transition.
+        return sum(len(level) for level in computation_tree)
+
+# Define a class for the vectorized Turing Machine Simulator
+class VectorizedSimulator(TuringMachineSimulator):
+    """This class simulates a Turing machine with NumPy, stepping a whole breadth-first level at a time."""
+    def __init__(self, turing_machine, stats=None, on_level=None, on_step=None):
+        """
+        Initialize the VectorizedSimulator instance with a Turing machine.
+
+        Parameters:
+        turing_machine (NewTuringMachine): The Turing machine to be simulated.
+        stats (SimulationStats): Metrics to fill in during the simulation, or None.
+        on_level (callable): Called as on_level(depth, frontier_size) before each level is expanded, or None.
+        on_step (callable): Called as on_step(depth, state, head) for each configuration expanded, or None.
+        """
+        if np is None:
+            raise RuntimeError('the vectorized engine requires NumPy')
+        super().__init__(turing_machine, stats, on_level, on_step)
+
+    def iter_search(self, input_string, transitions, keep_tree=False, max_depth=None, max_nodes=None,
+                    max_seconds=None, deduplicate=False, checkpoint=None, checkpoint_every=60.0, resume=False):
+        """
+        Search the computation tree breadth-first with the whole frontier stored as NumPy arrays.
+
+        The level loop is the one of `TuringMachineSimulator.iter_search`; see `expand_level` for how a level
+        is expanded. Configurations, their order, the outcome and the attributes set on the simulator are the
+        same as for the python engine; deduplication and checkpoints are not supported.
+
+        Parameters:
+        input_string (str): The input string for the Turing machine simulation.
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        keep_tree (bool): Whether to keep the whole computation tree for path reconstruction.
+        max_depth (int): Maximum number of levels to expand, or None for no limit.
+        max_nodes (int): Maximum number of configurations to create, or None for no limit.
+        max_seconds (float): Maximum wall-clock time of the search, checked between levels, or None for no limit.
+        deduplicate (bool): Must be False.
+        checkpoint (str): Must be None.
+        checkpoint_every (float): Unused.
+        resume (bool): Unused.
+
+        Yields:
+        tuple: The depth, state ids and head positions of each level as it is expanded.
+        """
+        if deduplicate:
+            raise ValueError('the vectorized engine does not support deduplication')
+        if checkpoint is not None:
+            raise ValueError('the vectorized engine does not support checkpoints')
+        return (yield from super().iter_search(input_string, transitions, keep_tree, max_depth, max_nodes,
+                                               max_seconds))
+
+    def start_frontier(self, transitions, tape, root_hash):
+        """
+        Return the frontier holding the start configuration, or an empty one if the start state halts.
+
+        Parameters:
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        tape (bytearray): The encoded input tape.
+        root_hash (int): Unused.
+
+        Returns:
+        tuple: The index in the level, state id and head of every live configuration as vectors, and their
+               tapes as a 2-D uint8 matrix padded with blanks.
+        """
+        indices = np.zeros(1, dtype=np.int64)
+        states = np.full(1, transitions.start, dtype=np.int64)
+        heads = np.zeros(1, dtype=np.int64)
+        tapes = np.full((1, max(len(tape), 1)), transitions.blank, dtype=np.uint8)
+        tapes[0, :len(tape)] = np.frombuffer(bytes(tape), dtype=np.uint8)
+        if transitions.start in (transitions.accept, transitions.reject):
+            return indices[:0], states[:0], heads[:0], tapes[:0]
+        return indices, states, heads, tapes
+
+    def frontier_size(self, frontier):
+        """Return the number of live configurations in a frontier."""
+        return len(frontier[0])
+
+    def expand_level(self, transitions, frontier, depth, max_nodes, visited):
+        """
+        Expand the whole frontier into the next level with one batched lookup into the dense transition tables.
+
+        Every configuration is repeated once per applicable action and the child tapes are gathered from their
+        parents. The level is cut at the first accepting configuration, and before the first configuration
+        that would be expanded once the search created `max_nodes` configurations, as in the python engine.
+
+        Parameters:
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        frontier (tuple): The live configurations of the last level, as built by `start_frontier`.
+        depth (int): The depth of the level being built.
+        max_nodes (int): Maximum number of configurations to create, or None for no limit.
+        visited (set): Unused.
+
+        Yields:
+        tuple: The depth, state ids and head positions of the level.
+
+        Returns:
+        tuple: The new ComputationLevel, the next frontier (None once the search ends), whether the level
+               accepted and whether the node budget cut the level.
+        """
+        tables = transitions.dense_tables()
+        indices, states, heads, tapes = frontier
+        # Widen the tape matrix with blanks when a head moved past its last column
+        if heads.max() >= tapes.shape[1]:
+            padding = np.full((len(tapes), tapes.shape[1]), transitions.blank, dtype=np.uint8)
+            tapes = np.concatenate([tapes, padding], axis=1)
+        symbols = tapes[np.arange(len(tapes)), heads]
+        counts = tables['count'][states, symbols]
+
+        truncated = False
+        if max_nodes is not None:
+            # Expand only the configurations the node budget still allows, as the sequential search does
+            nodes_before = np.cumsum(counts) - counts
+            allowed = int(np.count_nonzero(self.node_count + nodes_before < max_nodes))
+            if allowed < len(indices):
+                truncated = True
+                indices, states, heads, tapes = indices[:allowed], states[:allowed], heads[:allowed], tapes[:allowed]
+                symbols, counts = symbols[:allowed], counts[:allowed]
+        if self.stats is not None:
+            self.record_level(transitions, tables, states, symbols, counts, tapes.shape[1])
+        if self.on_step is not None:
+            for state, head in zip(states.tolist(), heads.tolist()):
+                self.on_step(depth - 1, transitions.state_names[state], head)
+        yield depth - 1, states, heads
+
+        # Repeat every configuration once per applicable action and gather the actions
+        parents = np.repeat(np.arange(len(indices)), counts)
+        actions = np.arange(len(parents)) - np.repeat(np.cumsum(counts) - counts, counts)
+        parent_states, parent_symbols, parent_heads = states[parents], symbols[parents], heads[parents]
+        child_states = tables['next'][parent_states, parent_symbols, actions]
+        child_writes = tables['write'][parent_states, parent_symbols, actions]
+        child_cells = tables['cell'][parent_states, parent_symbols, actions]
+        child_heads = np.maximum(parent_heads + tables['move'][parent_states, parent_symbols, actions], 0)
+
+        # Stop at the first configuration of the level that accepts
+        accepting = np.flatnonzero(child_states == transitions.accept)
+        accepted = len(accepting) > 0
+        if accepted:
+            size = int(accepting[0]) + 1
+            parents, parent_heads, parent_symbols = parents[:size], parent_heads[:size], parent_symbols[:size]
+            child_states, child_writes = child_states[:size], child_writes[:size]
+            child_cells, child_heads = child_cells[:size], child_heads[:size]
+
+        # Misses keep the tape unchanged and record no delta
+        writes = child_cells.astype(bool)
+        current_level = ComputationLevel()
+        current_level.parent.frombytes(indices[parents].astype('l').tobytes())
+        current_level.state.frombytes(child_states.astype('l').tobytes())
+        current_level.head.frombytes(np.where(writes, child_heads, parent_heads).astype('l').tobytes())
+        current_level.cell.frombytes(np.where(writes, parent_heads, -1).astype('l').tobytes())
+        current_level.old.frombytes(np.where(writes, parent_symbols, -1).astype('l').tobytes())
+        current_level.new.frombytes(np.where(writes, child_writes, -1).astype('l').tobytes())
+        if accepted or truncated:
+            return current_level, None, accepted, truncated
+
+        # Keep the live children as the next frontier, writing their tapes in one batch
+        live = np.flatnonzero(child_states != transitions.reject)
+        tapes = tapes[parents[live]]
+        tapes[np.arange(len(live)), parent_heads[live]] = child_writes[live]
+        return current_level, (live, child_states[live], child_heads[live], tapes), False, False
+
+    def record_level(self, transitions, tables, states, symbols, counts, width):
+        """
+        Add the metrics of one vectorized level to the simulator's stats.
+
+        Parameters:
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        tables (dict): The dense transition tables.
+        states (numpy.ndarray): State ids of the configurations expanded.
+        symbols (numpy.ndarray): Symbol ids under their heads.
+        counts (numpy.ndarray): Number of successors of each configuration.
+        width (int): Width of the tape matrix.
+        """
+        stats = self.stats
+        # Pairs without rules have a single reject action that writes nothing
+        matched = tables['cell'][states, symbols, 0].astype(bool)
+        stats.lookups += len(states)
+        stats.matched += int(np.count_nonzero(matched))
+        stats.actions += int(counts[matched].sum())
+        stats.tape_high_water = max(stats.tape_high_water, width)
+        for state, hits in enumerate(np.bincount(states, minlength=len(transitions.state_names)).tolist()):
+            if hits:
+                stats.state_hits[transitions.state_names[state]] += hits
+
+def expand_block(pieces, chunk, table, blank, accept, reject, cancel=None, limit=None, collect=False):
+    """
+    Expand a block of frontier configurations into the next level, in frontier order.
+
+    A block is a list of frontier pieces. Each piece is a tuple (base, indices, states, heads, offsets, tapes):
+    the level index of every configuration is `base` plus its entry in `indices`, and its tape is the slice
+    of the `tapes` bytes between two consecutive `offsets`. The live children are returned as one such piece
+    with base 0, so blocks travel between processes as a few flat arrays instead of lists of tuples.
+
+    Parameters:
+    pieces (list): The frontier pieces to expand.
+    chunk (int): The position of the block within its level.
+    table (dict): The compiled transition table, (state id, symbol id) -> tuple of actions.
+    blank (int): The symbol id of the blank symbol.
+    accept (int): The state id of the accept state.
+    reject (int): The state id of the reject state.
+    cancel (multiprocessing.Value): The position of the first block of the level that accepted, or None.
+    limit (int): Maximum number of children to create, or None for no limit.
+    collect (bool): Whether to count the hits of every state.
+
+    Returns:
+    tuple: The ComputationLevel of the children, the live children as a frontier piece, the index of the
+           accepting child (-1 if none), whether `limit` stopped the expansion, and the metrics (expanded,
+           matched, actions applied, longest tape, state hits); or None if an earlier block accepted first.
+    """
+    level = ComputationLevel()
+    live_indices, live_states, live_heads = array('l'), array('l'), array('l')
+    live_offsets = array('q', [0])
+    live_tapes = bytearray()
+    state_hits = collections.Counter() if collect else None
+    expanded = matched = applied = tape_high_water = 0
+    accepted = -1
+    # Bind the appends of the level arrays once; this loop is the hot path of every worker
+    append_parent, append_state, append_head = level.parent.append, level.state.append, level.head.append
+    append_cell, append_old, append_new = level.cell.append, level.old.append, level.new.append
+    for base, indices, states, heads, offsets, tapes in pieces:
+        first = offsets[0]
+        tapes = memoryview(tapes)
+        for position in range(len(states)):
+            if limit is not None and len(level.state) >= limit:
+                return level, (0, live_indices, live_states, live_heads, live_offsets, bytes(live_tapes)), -1, True, \
+                    (expanded, matched, applied, tape_high_water, state_hits)
+            # Give up once a block earlier in the level reached the accept state
+            if cancel is not None and not expanded % 256 and cancel.value < chunk:
+                return None
+            expanded += 1
+            parent, state, head = base + indices[position], states[position], heads[position]
+            tape = bytearray(tapes[offsets[position] - first:offsets[position + 1] - first])
+            # Extend the tape with a blank symbol if needed
+            if head >= len(tape):
+                tape.append(blank)
+            symbol = tape[head]
+            actions = table.get((state, symbol))
+            if collect:
+                state_hits[state] += 1
+                tape_high_water = max(tape_high_water, len(tape))
+                if actions:
+                    matched += 1
+                    applied += len(actions)
+            if not actions:
+                # If no rule matches, transition straight to the reject state
+                append_parent(parent)
+                append_state(reject)
+                append_head(head)
+                append_cell(-1)
+                append_old(-1)
+                append_new(-1)
+                continue
+            for next_state, write, direction in actions:
+                # The head never moves off the left end of the tape
+                child_head = head + direction if head + direction >= 0 else 0
+                index = len(level.state)
+                append_parent(parent)
+                append_state(next_state)
+                append_head(child_head)
+                append_cell(head)
+                append_old(symbol)
+                append_new(write)
+                if next_state == accept:
+                    accepted = index
+                    break
+                if next_state != reject:
+                    tape[head] = write
+                    live_indices.append(index)
+                    live_states.append(next_state)
+                    live_heads.append(child_head)
+                    live_tapes += tape
+                    live_offsets.append(len(live_tapes))
+            if accepted != -1:
+                if cancel is not None:
+                    with cancel.get_lock():
+                        cancel.value = min(cancel.value, chunk)
+                return level, None, accepted, False, (expanded, matched, applied, tape_high_water, state_hits)
+    return level, (0, live_indices, live_states, live_heads, live_offsets, bytes(live_tapes)), -1, False, \
+        (expanded, matched, applied, tape_high_water, state_hits)
+
+def split_frontier(frontier, chunk_size):
+    """
+    Split a frontier into blocks of about `chunk_size` configurations, keeping the frontier order.
+
+    Parameters:
+    frontier (list): The frontier pieces, as produced by `expand_block`.
+    chunk_size (int): Number of configurations per block.
+
+    Returns:
+    generator: The blocks, each a list of frontier pieces.
+    """
+    block, size = [], 0
+    for base, indices, states, heads, offsets, tapes in frontier:
+        start = 0
+        while start < len(states):
+            end = min(len(states), start + chunk_size - size)
+            block.append((base, indices[start:end], states[start:end], heads[start:end], offsets[start:end + 1],
+                          tapes[offsets[start] - offsets[0]:offsets[end] - offsets[0]]))
+            size += end - start
+            start = end
+            if size == chunk_size:
+                yield block
+                block, size = [], 0
+    if block:
+        yield block
+
+# Transition table and cancel flag of the worker processes of a parallel search
+parallel_context = None
+
+def init_parallel_worker(table, blank, accept, reject, cancel):
+    """Install the transition table and the shared cancel flag in a worker process."""
+    global parallel_context
+    parallel_context = (table, blank, accept, reject, cancel)
+
+def run_parallel_block(chunk, pieces, collect):
+    """Expand one block of a level in a worker process."""
+    table, blank, accept, reject, cancel = parallel_context
+    return expand_block(pieces, chunk, table, blank, accept, reject, cancel, None, collect)
+
+# Define a class for the parallel Turing Machine Simulator
+class ParallelSimulator(TuringMachineSimulator):
+    """This class simulates a Turing machine by splitting each wide breadth-first level across worker processes."""
+    def __init__(self, turing_machine, stats=None, on_level=None, on_step=None, workers=None, min_parallel=4096,
+                 chunk_size=None):
+        """
+        Initialize the ParallelSimulator instance with a Turing machine.
+
+        Parameters:
+        turing_machine (NewTuringMachine): The Turing machine to be simulated.
+        stats (SimulationStats): Metrics to fill in during the simulation, or None.
+        on_level (callable): Called as on_level(depth, frontier_size) before each level is expanded, or None.
+        on_step (callable): Called as on_step(depth, state, head) for each configuration expanded, or None.
+        workers (int): Number of worker processes (default: number of CPUs).
+        min_parallel (int): Levels with fewer configurations are expanded in the current process.
+        chunk_size (int): Configurations per block sent to a worker, or None for four blocks per worker.
+        """
+        super().__init__(turing_machine, stats, on_level, on_step)
+        self.workers = workers or os.cpu_count() or 1
+        self.min_parallel = min_parallel
+        self.chunk_size = chunk_size
+        self.executor = None  # Pool of worker processes of the running search
+        self.cancel = None    # Shared position of the first accepting block of the level
+
+    def iter_search(self, input_string, transitions, keep_tree=False, max_depth=None, max_nodes=None,
+                    max_seconds=None, deduplicate=False, checkpoint=None, checkpoint_every=60.0, resume=False):
+        """
+        Search the computation tree breadth-first, expanding wide levels on a pool of worker processes.
+
+        The level loop is the one of `TuringMachineSimulator.iter_search`; see `expand_level` for how a level
+        is expanded. Configurations, their order, the outcome and the attributes set on the simulator are the
+        same as for the python engine; deduplication and checkpoints are not supported.
+
+        Parameters:
+        input_string (str): The input string for the Turing machine simulation.
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        keep_tree (bool): Whether to keep the whole computation tree for path reconstruction.
+        max_depth (int): Maximum number of levels to expand, or None for no limit.
+        max_nodes (int): Maximum number of configurations to create, or None for no limit.
+        max_seconds (float): Maximum wall-clock time of the search, checked between levels, or None for no limit.
+        deduplicate (bool): Must be False.
+        checkpoint (str): Must be None.
+        checkpoint_every (float): Unused.
+        resume (bool): Unused.
+
+        Yields:
+        tuple: The depth and the number of configurations of each level as it is expanded.
+        """
+        if deduplicate:
+            raise ValueError('the parallel engine does not support deduplication')
+        if checkpoint is not None:
+            raise ValueError('the parallel engine does not support checkpoints')
+        return (yield from super().iter_search(input_string, transitions, keep_tree, max_depth, max_nodes,
+                                               max_seconds))
+
+    def start_frontier(self, transitions, tape, root_hash):
+        """
+        Return the frontier holding the start configuration, or an empty one if the start state halts.
+
+        Parameters:
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        tape (bytearray): The encoded input tape.
+        root_hash (int): Unused.
+
+        Returns:
+        list: The frontier pieces, as produced by `expand_block`.
+        """
+        if transitions.start in (transitions.accept, transitions.reject):
+            return []
+        return [(0, array('l', [0]), array('l', [transitions.start]), array('l', [0]), array('q', [0, len(tape)]),
+                 bytes(tape))]
+
+    def frontier_size(self, frontier):
+        """Return the number of live configurations in a frontier."""
+        return sum(len(piece[2]) for piece in frontier)
+
+    def end_search(self):
+        """Shut down the worker processes started for the search, if any."""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def expand_level(self, transitions, frontier, depth, max_nodes, visited):
+        """
+        Expand the frontier into the next level, on the worker processes when the level is wide enough.
+
+        A level with at least `min_parallel` configurations is split into blocks that the workers expand
+        independently; the child levels are concatenated in block order, which gives the same parent indices
+        as a sequential expansion. A worker that reaches the accept state flags it in shared memory and the
+        workers on later blocks stop early. The node budget cuts the merged children in block order: the
+        block that crosses it is expanded again in the current process up to the budget, so the level ends at
+        the same configuration as in the python engine.
+
+        Parameters:
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        frontier (list): The frontier pieces of the last level, as built by `start_frontier`.
+        depth (int): The depth of the level being built.
+        max_nodes (int): Maximum number of configurations to create, or None for no limit.
+        visited (set): Unused.
+
+        Yields:
+        tuple: The depth and the number of configurations of the level.
+
+        Returns:
+        tuple: The new ComputationLevel, the next frontier, whether the level accepted and whether the node
+               budget cut the level.
+        """
+        table = transitions.table
+        blank = transitions.blank
+        accept = transitions.accept
+        reject = transitions.reject
+        state_names = transitions.state_names
+        stats = self.stats
+        size = self.frontier_size(frontier)
+        collect = stats is not None
+        if self.on_step is not None:
+            for piece in frontier:
+                for state, head in zip(piece[2], piece[3]):
+                    self.on_step(depth - 1, state_names[state], head)
+        yield depth - 1, size
+
+        if size < self.min_parallel or self.workers <= 1:
+            limit = max_nodes - self.node_count if max_nodes is not None else None
+            results = [expand_block(frontier, 0, table, blank, accept, reject, None, limit, collect)]
+        else:
+            if self.executor is None:
+                self.cancel = multiprocessing.Value('q', 0)
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_parallel_worker,
+                                                    initargs=(table, blank, accept, reject, self.cancel))
+            self.cancel.value = sys.maxsize
+            chunk_size = self.chunk_size or -(-size // (4 * self.workers))
+            blocks = list(split_frontier(frontier, chunk_size))
+            futures = [self.executor.submit(run_parallel_block, chunk, block, collect)
+                       for chunk, block in enumerate(blocks)]
+            results = []
+            children = self.node_count  # Configurations created once the blocks merged so far are added
+            for chunk, future in enumerate(futures):
+                result = future.result()
+                if max_nodes is not None and children + len(result[0]) > max_nodes:
+                    # The node budget runs out within this block, so expand it again up to the budget
+                    result = expand_block(blocks[chunk], chunk, table, blank, accept, reject, None,
+                                          max_nodes - children, collect)
+                results.append(result)
+                children += len(result[0])
+                if result[2] != -1 or result[3]:
+                    # Blocks after the first accepting or truncated one are not needed
+                    for pending in futures[chunk + 1:]:
+                        pending.cancel()
+                    break
+
+        # Concatenate the child levels in block order
+        current_level = ComputationLevel()
+        next_frontier = []
+        accepted = truncated = False
+        for level, live, accept_index, level_truncated, metrics in results:
+            offset = len(current_level)
+            for field in ComputationLevel.__slots__:
+                getattr(current_level, field).extend(getattr(level, field))
+            if stats is not None:
+                expanded, matched, applied, tape_high_water, state_hits = metrics
+                stats.lookups += expanded
+                stats.matched += matched
+                stats.actions += applied
+                stats.tape_high_water = max(stats.tape_high_water, tape_high_water)
+                for state, hits in state_hits.items():
+                    stats.state_hits[state_names[state]] += hits
+            if accept_index != -1:
+                accepted = True
+                break
+            truncated = truncated or level_truncated
+            if len(live[2]):
+                next_frontier.append((offset,) + live[1:])
+        return current_level, next_frontier, accepted, truncated
+
+# Simulation engines selectable from the command line
+ENGINES = {'python': TuringMachineSimulator, 'numpy': VectorizedSimulator, 'parallel': ParallelSimulator}
+
+# Define a class for running one machine over many input strings
+class BatchRunner:
+    """This class runs a parsed and compiled Turing machine over a batch of input strings."""
+    def __init__(self, turing_machine, transitions, simulator_class=TuringMachineSimulator, collect_stats=False,
+                 accelerate=False, **search_options):
+        """
+        Initialize the BatchRunner with a parsed Turing machine and its compiled transitions.
+
+        Parameters:
+        turing_machine (NewTuringMachine): The Turing machine to be simulated.
+        transitions (CompiledTransitions): The indexed transition table of the Turing machine.
+        simulator_class (type): The simulation engine, one of the values of ENGINES.
+        collect_stats (bool): Whether to add the metrics of each run to its result.
+        accelerate (bool): Whether to decide with `TuringMachineSimulator.decide_accelerated`.
+        search_options: Keyword arguments passed on to `TuringMachineSimulator.decide`, or to
+                        `TuringMachineSimulator.decide_accelerated` when accelerating.
+        """
+        self.turing_machine = turing_machine
+        self.transitions = transitions
+        self.simulator_class = simulator_class
+        self.collect_stats = collect_stats
+        self.accelerate = accelerate
+        self.search_options = search_options
+
+    def run(self, input_string):
+        """
+        Simulate the machine on one input string.
+
+        Parameters:
+        input_string (str): The input string for the Turing machine simulation.
+
+        Returns:
+        dict: The input string, its status (accepted, rejected or undecided), the number of steps, the
+              number of transitions traced and, if collected, the metrics of the run.
+        """
+        stats = SimulationStats() if self.collect_stats else None
+        simulator = self.simulator_class(self.turing_machine, stats)
+        decide = simulator.decide_accelerated if self.accelerate else simulator.decide
+        status, steps = decide(input_string, self.transitions, **self.search_options)
+        if status == UNDECIDED:
+            result = UNDECIDED
+        else:
+            result = 'accepted' if status == self.turing_machine.accept_state[0] else 'rejected'
+        output = {
+            'input': input_string,
+            'status': result,
+            'steps': steps,
+            'transitions': simulator.node_count - 1,  # Every configuration but the start one took a transition
+        }
+        if stats is not None:
+            output['stats'] = stats.as_dict()
+        return output
+
+    def run_all(self, input_strings, workers=1, chunk_size=64):
+        """
+        Simulate the machine on every input string, yielding the results in input order.
+
+        With more than one worker the strings are spread over a process pool in chunks; each worker
+        receives the compiled machine once when it starts. At most two chunks per worker are in flight, so
+        the input is read lazily and results are yielded as soon as every earlier chunk is done.
+
+        Parameters:
+        input_strings (iterable): The input strings to simulate.
+        workers (int): Number of worker processes (1 runs in the current process).
+        chunk_size (int): Number of input strings sent to a worker at a time.
+
+        Returns:
+        generator: The result dictionaries, in the same order as the input strings.
+        """
+        if workers <= 1:
+            for input_string in input_strings:
+                yield self.run(input_string)
+            return
+        input_strings = iter(input_strings)
+        pending = collections.deque()  # Futures of the submitted chunks, in input order
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker, initargs=(self,)) as executor:
+            while True:
+                # Top up the in-flight chunks before waiting for the oldest one, passing on finished chunks
+                # before each read since reading stdin may block
+                while len(pending) < workers * 2:
+                    while pending and pending[0].done():
+                        yield from pending.popleft().result()
+                    chunk = list(itertools.islice(input_strings, chunk_size))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(run_batch_chunk, chunk))
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+
+# Runner used by the worker processes of a batch
+batch_runner = None
+
+def init_batch_worker(runner):
+    """Install the batch runner in a worker process."""
+    global batch_runner
+    batch_runner = runner
+
+def run_batch_chunk(input_strings):
+    """Simulate a chunk of input strings with the batch runner of the worker process."""
+    return [batch_runner.run(input_string) for input_string in input_strings]
+
+def read_input_strings(source):
+    """
+    Read input strings, one per line, from a file or from stdin.
+
+    Parameters:
+    source (str): Path of the file to read, or '-' for stdin.
+
+    Returns:
+    generator: The input strings without their line endings.
+    """
+    opened_file = sys.stdin if source == '-' else open(source, 'r')
+    try:
+        for line in opened_file:
+            yield line.rstrip('\r\n')
+    finally:
+        if opened_file is not sys.stdin:
+            opened_file.close()
+
+# Define a class for writing output lines
+class TraceWriter:
+    """This class streams output lines to a file, optionally gzip-compressed, and to the console."""
+    def __init__(self, path=None, compress=False, echo=True, buffer_size=1 << 20):
+        """
+        Open the output file for appending.
+
+        Lines are collected and written out in chunks of about `buffer_size` characters instead of one write
+        per line. Appending to a gzip file adds a new gzip member, which gzip readers concatenate.
+
+        Parameters:
+        path (str): Path of the output file, or None to only write to the console.
+        compress (bool): Whether to gzip-compress the output file.
+        echo (bool): Whether to write the lines to stdout as well.
+        buffer_size (int): Number of characters collected before they are written.
+        """
+        self.file = None
+        if path is not None:
+            self.file = gzip.open(path, 'at') if compress else open(path, 'a')
+        self.echo = echo
+        self.buffer_size = buffer_size
+        self.lines = []  # Lines not written yet
+        self.size = 0    # Number of characters in the pending lines
+
+    def write(self, line):
+        """Add a line, writing out the pending lines once they fill the buffer."""
+        self.lines.append(line)
+        self.size += len(line) + 1
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def write_record(self, record):
+        """Add a dictionary as one compact JSON line."""
+        self.write(json.dumps(record, separators=(',', ':')))
+
+    def flush(self):
+        """Write out the pending lines as one chunk."""
+        if self.lines:
+            chunk = '\n'.join(self.lines) + '\n'
+            if self.file is not None:
+                self.file.write(chunk)
+            if self.echo:
+                sys.stdout.write(chunk)
+            self.lines, self.size = [], 0
+        if self.echo:
+            sys.stdout.flush()
+
+    def close(self):
+        """Write out the pending lines and close the output file."""
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 def main():
     """Main function to execute the Turing machine simulation."""
@@ -288,39 +1913,175 @@ def main():
     # Parsing command line arguments
     parser = argparse.ArgumentParser(description="Turing Machine Simulator")
     parser.add_argument('input_file', type=str, help='Input file for the Turing Machine')
-    parser.add_argument('input_string', type=str, help='Input string to process')
+    parser.add_argument('input_string', type=str, nargs='?', help='Input string to process')
+    parser.add_argument('--max-depth', type=int, default=None, help='Maximum number of steps to explore')
+    parser.add_argument('--max-nodes', type=int, default=None,
+                        help='Maximum number of configurations in the computation tree '
+                             '(default: 1000000, or no limit with --accelerate)')
+    parser.add_argument('--max-seconds', type=float, default=None, help='Maximum search time in seconds')
+    parser.add_argument('--deduplicate', action='store_true',
+                        help='Prune configurations (state, head and tape) that were already reached')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='python',
+                        help="Simulation engine: 'python' steps one configuration at a time, 'numpy' steps whole "
+                             "breadth-first levels as arrays, 'parallel' splits wide levels across --workers "
+                             "processes (default: python)")
+    parser.add_argument('--stats', action='store_true',
+                        help='Report frontier sizes, transition lookups, tape growth, phase times and state hits')
+    parser.add_argument('--batch', type=str, default=None, metavar='FILE',
+                        help="Simulate every line of FILE ('-' for stdin) and print the results as JSON lines")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes for batch mode or the parallel engine '
+                             '(default: number of CPUs)')
+    parser.add_argument('--chunk-size', type=int, default=64,
+                        help='Number of input strings sent to a worker at a time in batch mode (default: 64)')
+    parser.add_argument('--accelerate', action='store_true',
+                        help='Decide a deterministic machine with cached macro steps; no computation steps are traced')
+    parser.add_argument('--macro-window', type=int, default=8,
+                        help='Tape cells on each side of the head in an accelerated macro step (default: 8)')
+    parser.add_argument('--macro-cache', type=int, default=65536,
+                        help='Maximum number of cached macro steps with --accelerate (default: 65536)')
+    parser.add_argument('--checkpoint', type=str, default=None, metavar='PATH',
+                        help='Periodically save the search to PATH so it can be resumed')
+    parser.add_argument('--checkpoint-every', type=float, default=60.0, metavar='SECONDS',
+                        help='Seconds between checkpoints (default: 60)')
+    parser.add_argument('--resume', action='store_true', help='Continue the search saved in the --checkpoint file')
+    parser.add_argument('--output', type=str, default=None, metavar='PATH',
+                        help='File the output is appended to (default: <machine>_output, <machine>_output.jsonl with '
+                             '--format jsonl, or none in batch mode)')
+    parser.add_argument('--format', choices=['text', 'jsonl'], default='text',
+                        help="Output format: 'text' traces every configuration, 'jsonl' writes compact JSON records "
+                             "with one tape delta per step (default: text)")
+    parser.add_argument('--gzip', action='store_true', help='Gzip-compress the output file')
+    parser.add_argument('--quiet', action='store_true', help='Do not echo the output to the console')
+    parser.add_argument('--min-parallel', type=int, default=4096,
+                        help='Smallest level the parallel engine splits across workers (default: 4096)')
     args = parser.parse_args()
+    if (args.input_string is None) == (args.batch is None):
+        parser.error('provide either an input string or --batch')
+    if args.engine == 'numpy' and np is None:
+        parser.error('the numpy engine requires NumPy to be installed')
+    if args.engine != 'python' and args.deduplicate:
+        parser.error(f'the {args.engine} engine does not support --deduplicate')
+    if args.engine == 'parallel' and args.batch is not None:
+        parser.error('batch mode already runs on --workers processes; use another engine')
+    if args.accelerate and args.deduplicate:
+        parser.error('--accelerate does not support --deduplicate')
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    if args.macro_window < 1:
+        parser.error('--macro-window must be at least 1')
+    if args.macro_cache < 0:
+        parser.error('--macro-cache must not be negative')
+    if args.max_nodes is None and not args.accelerate:
+        args.max_nodes = 1000000
+    if args.resume and args.checkpoint is None:
+        parser.error('--resume requires --checkpoint')
+    if args.batch is not None and args.quiet and args.output is None:
+        parser.error('--quiet with --batch requires --output')
+    if args.checkpoint is not None and (args.engine != 'python' or args.accelerate or args.batch is not None):
+        parser.error('--checkpoint is only supported for single runs of the python engine')
 
     input_file = args.input_file
     input_string = args.input_string
 
-    turing_machine = NewTuringMachine(input_file)
-    simulator = TuringMachineSimulator(turing_machine)
-    states_map = turing_machine.decompose_transition()
-    computation_tree, status = simulator.compute_tree(input_string, states_map)
-
-    size = simulator.compute_transitions(computation_tree)
-    path = simulator.compute_path_len(computation_tree)
-    ans = simulator.set_output(computation_tree)
-
-    # Enhanced output formatting
-    output_lines = []
-    output_lines.append('==== Turing Machine Simulation Output ====')
-    output_lines.append(f'Machine Name: {turing_machine.machine_name[0]}')
-    output_lines.append(f'Input String: {input_string}')
-    output_lines.append(f'Total Transitions Traced: {size - 2}')
-    result = 'accepted' if status == turing_machine.accept_state[0] else 'rejected'
-    output_lines.append(f'String {result} in {len(path) - 1} steps')
-    output_lines.append('---- Computation Steps ----')
-    for s in ans[::-1]:
-        output_lines.append(f'  {s}')
-
-    # Append to the output file instead of overwriting
-    output_filename = f'{turing_machine.machine_name[0]}_output'
-    with open(output_filename, 'a') as file:  # Use 'a' mode for append
-        for line in output_lines:
-            print(line)
-            file.write(line + '\n')
+    stats = SimulationStats() if args.stats else None
+    with stats.phase('parse') if stats is not None else contextlib.nullcontext():
+        turing_machine = NewTuringMachine(input_file)
+        transitions = turing_machine.compile_transitions()
+    if args.engine == 'parallel':
+        simulator = ParallelSimulator(turing_machine, stats, workers=args.workers, min_parallel=args.min_parallel)
+    else:
+        simulator = ENGINES[args.engine](turing_machine, stats)
+    search_options = {'max_depth': args.max_depth, 'max_nodes': args.max_nodes, 'max_seconds': args.max_seconds}
+    if args.accelerate:
+        search_options.update(window=args.macro_window, cache_size=args.macro_cache)
+        if any(len(actions) > 1 for actions in transitions.table.values()):
+            parser.error('--accelerate requires a deterministic machine')
+    else:
+        search_options['deduplicate'] = args.deduplicate
+
+    if args.batch is not None:
+        # Stream one JSON line per input string, in input order
+        runner = BatchRunner(turing_machine, transitions, ENGINES[args.engine], args.stats, args.accelerate,
+                             **search_options)
+        with TraceWriter(args.output, args.gzip, not args.quiet, 1 << 16) as writer:
+            for result in runner.run_all(read_input_strings(args.batch), args.workers, args.chunk_size):
+                writer.write(json.dumps(result))
+                if writer.echo and sys.stdout.isatty():
+                    # Show each result on an interactive console as soon as it is known
+                    writer.flush()
+        return
+
+    if args.accelerate:
+        # Only the verdict and the exact step count are computed, without a computation tree
+        status, steps = simulator.decide_accelerated(input_string, transitions, **search_options)
+        size = simulator.node_count
+        depth = steps
+    else:
+        try:
+            computation_tree, status = simulator.compute_tree(input_string, transitions, checkpoint=args.checkpoint,
+                                                              checkpoint_every=args.checkpoint_every,
+                                                              resume=args.resume, **search_options)
+        except ValueError as error:
+            parser.error(str(error))
+        size = simulator.compute_transitions(computation_tree)
+        steps = len(simulator.compute_path_len(computation_tree)) - 1
+        depth = len(computation_tree) - 1
+
+    if status == UNDECIDED:
+        result = UNDECIDED
+    else:
+        result = 'accepted' if status == turing_machine.accept_state[0] else 'rejected'
+    # Every configuration created, except the start configuration, was reached by one transition
+    transitions_traced = simulator.node_count - 1
+    # Append to the output file instead of overwriting, streaming the trace in root-to-leaf order
+    # JSON lines get their own default file so they are never mixed into a text report
+    extension = ('.jsonl' if args.format == 'jsonl' else '') + ('.gz' if args.gzip else '')
+    output_filename = args.output or f'{turing_machine.machine_name[0]}_output{extension}'
+    with TraceWriter(output_filename, args.gzip, not args.quiet) as writer:
+        if args.format == 'jsonl':
+            summary = {'machine': turing_machine.machine_name[0], 'input': input_string, 'status': result,
+                       'steps': steps, 'transitions': transitions_traced}
+            if args.deduplicate:
+                summary['pruned'] = simulator.pruned_count
+            if status == UNDECIDED:
+                summary.update(budget=simulator.budget_exhausted, depth=depth, configurations=size)
+            if args.accelerate:
+                summary.update(macro_steps=simulator.macro_steps, cache_hits=simulator.cache_info.hits,
+                               cache_misses=simulator.cache_info.misses)
+            writer.write_record(summary)
+            if not args.accelerate:
+                for record in simulator.iter_records(computation_tree):
+                    writer.write_record(record)
+            if stats is not None:
+                writer.write_record({'stats': stats.as_dict()})
+            return
+
+        # Enhanced output formatting
+        writer.write('==== Turing Machine Simulation Output ====')
+        writer.write(f'Machine Name: {turing_machine.machine_name[0]}')
+        writer.write(f'Input String: {input_string}')
+        writer.write(f'Total Transitions Traced: {transitions_traced}')
+        if args.deduplicate:
+            writer.write(f'Duplicate Configurations Pruned: {simulator.pruned_count}')
+        if status == UNDECIDED:
+            # Report how far the search got before the budget ran out
+            writer.write(f'String undecided after {steps} steps ({simulator.budget_exhausted} budget exhausted at '
+                         f'depth {depth}, {size} configurations)')
+        else:
+            writer.write(f'String {result} in {steps} steps')
+        if args.accelerate:
+            cache_info = simulator.cache_info
+            writer.write(f'Macro Steps: {simulator.macro_steps} ({cache_info.hits} cache hits, '
+                         f'{cache_info.misses} misses)')
+        else:
+            writer.write('---- Computation Steps ----')
+            for line in simulator.iter_output(computation_tree):
+                writer.write(f'  {line}')
+        if stats is not None:
+            writer.write('---- Statistics ----')
+            for line in stats.format_lines():
+                writer.write(f'  {line}')
 
 if __name__ == '__main__':
     main()